@@ -48,6 +48,9 @@ class PhyPortBase(Resource):
     def _xml_at_res(self, xml):
         return xml.find('.//interface')
 
+    def _xml_at_all(self):
+        return E.interfaces(E.interface)
+
     def _xml_to_py(self, has_xml, has_py):
         # common to all subclasses
         Resource._r_has_xml_status(has_xml, has_py)
@@ -8,6 +8,7 @@ from lxml.builder import E
 
 # package modules
 from jnpr.junos import jxml as JXML
+from jnpr.junos.exception import RpcError, ConfigLoadError
 
 P_JUNOS_EXISTS = '_exists'
 P_JUNOS_ACTIVE = '_active'
@@ -58,6 +59,8 @@ class Resource(object):
             # invokes the properties, they will auto-load when empty.
             self._rlist = []
             self._rcatalog = {}
+            self._rbulk = None
+            self._batch = None
             return
 
         # otherwise, a resource includes public attributes:
@@ -280,13 +283,21 @@ class Resource(object):
         if None == xml_change:
             return False
 
-        # write these changes to the device
-        rsp = self._r_config_write_xml(xml_change)
+        # write these changes to the device, or queue them when a
+        # write batch is open.  once written, :should: is copied into
+        # :has: and cleared; if the load fails for this resource, the
+        # changes are put back into :should:
 
-        # copy :should: into :has: and then clear :should:
-        self.has.update(self.should)
+        should = self.should.copy()
         self.should.clear()
 
+        def _restore():
+            for p_name, p_val in should.items():
+                self.should.setdefault(p_name, p_val)
+
+        self._r_config_write(xml_change, lambda: self.has.update(should),
+                             _restore)
+
         return True
 
     # -------------------------------------------------------------------------
@@ -338,10 +349,9 @@ class Resource(object):
         xml = self._xml_edit_at_res()
         xml.attrib.update(JXML.DEL)
         self._xml_hook_on_delete(xml)
-        rsp = self._r_config_write_xml(xml)
 
-        # reset the :has: attribute
-        self._r_has_init()
+        # then reset the :has: attribute
+        self._r_config_write(xml, self._r_has_init)
         return True
 
     # -------------------------------------------------------------------------
@@ -392,6 +402,21 @@ class Resource(object):
         rsp = self._r_config_write_xml(xml)
         return True
 
+    def batch(self):
+        """
+        returns a :WriteBatch: for this resource manager, to be used as a
+        context manager.  While it is open, :write(): and :delete(): of
+        the resources obtained from this manager, or from its sub-managers,
+        are collected and then loaded together in a single RPC::
+
+            with users.batch():
+                for name in names:
+                    users[name](userclass='read-only')
+        """
+        if not self.is_mgr:
+            raise RuntimeError("Only on a manager!")
+        return WriteBatch(self)
+
     def list_refresh(self):
         """
         reloads the managed resource list from the Junos device
@@ -412,14 +437,29 @@ class Resource(object):
 
     def _r_catalog(self):
         """
-        provide a 'default' catalog creator method that simply uses
-        the manager list and runs through each resource making
-        a refcopy to the :has: properties
-        """
-        zone_list = self.list
-        for name in zone_list:
-            r = self[name]
-            self._rcatalog[name] = r.has
+        provide a 'default' catalog creator method.  this simply runs
+        through each resource in the manager list making a refcopy to the
+        :has: properties.  when the resource implements :_xml_at_all():
+        their configuration is first read with a single request, which
+        each resource then reads from
+        """
+        get = self._xml_at_all()
+        if get is not None:
+            # each resource then reads its configuration from :_rbulk:
+            # rather than with its own request, see _r_config_read_xml
+            self._xml_hook_read_begin(get)
+            got = self.R.get_config(get)
+            self._rbulk = {}
+            for res_xml in got.xpath(Resource._xml_path(get)):
+                self._rbulk[res_xml.findtext('name').strip()] = res_xml
+
+        try:
+            zone_list = self.list
+            for name in zone_list:
+                r = self[name]
+                self._rcatalog[name] = r.has
+        finally:
+            self._rbulk = None
 
     def refresh(self):
         if not self.is_mgr:
@@ -566,8 +606,12 @@ class Resource(object):
 
     def _r_config_read_xml(self):
         """
-        read the resource config from the Junos device
+        read the resource config from the Junos device, or from what the
+        manager read for the whole catalog
         """
+        bulk = getattr(self._manager, '_rbulk', None)
+        if bulk is not None:
+            return bulk.get(self._name)
         get = self._xml_at_top()
         self._xml_hook_read_begin(get)
         got = self._junos.rpc.get_config(get)
@@ -584,6 +628,31 @@ class Resource(object):
         raise RuntimeError("Resource missing method: %s" %
                            self.__class__.__name__)
 
+    def _xml_at_all(self):
+        """
+        ~| optional |~
+        resource subclass may implement this
+
+        Create an XML structure that will be used to retrieve the
+        configuration of all the managed resources at once, for
+        the catalog.  It is the :_xml_at_top(): structure without the
+        resource name, e.g. <system><login><user/></login></system>.
+        :None: (default) means each resource is read on its own.
+        """
+        return None
+
+    @classmethod
+    def _xml_path(klass, xml):
+        """
+        the xpath from <configuration> to the innermost element of the
+        single-branch :xml: structure, e.g. 'system/login/user'
+        """
+        path = []
+        while xml is not None:
+            path.append(xml.tag)
+            xml = xml[0] if len(xml) else None
+        return '/'.join(path)
+
     def _xml_at_res(self, xml):
         """
         ~| WARNING |~
@@ -640,6 +709,38 @@ class Resource(object):
 
         return edit_xml if changed else None
 
+    def _r_batch(self):
+        """
+          the open :WriteBatch: this resource writes into, from its manager
+          or parent, or :None:
+        """
+        if self.is_mgr and self._batch is not None:
+            return self._batch
+        for up in (self._manager, self._parent):
+            if up is not None:
+                batch = up._r_batch()
+                if batch is not None:
+                    return batch
+        return None
+
+    def _r_config_write(self, xml, done, failed=None):
+        """
+          write the xml change to the Junos device and then call :done:,
+          or queue both into the open write batch; :failed: is called
+          when the batch load reports errors for this resource
+        """
+        batch = self._r_batch()
+        if batch is None:
+            try:
+                self._r_config_write_xml(xml)
+            except Exception:
+                if failed is not None:
+                    failed()
+                raise
+            done()
+        else:
+            batch._add(self, xml, done, failed)
+
     def _r_config_write_xml(self, xml):
         """
           write the xml change to the Junos device,
@@ -650,10 +751,13 @@ class Resource(object):
         try:
             result = self._junos.rpc.load_config(top_xml, action='replace')
         except Exception as err:
-            # see if this is OK or just a warning
-            if len(err.rsp.xpath('.//error-severity[. = "error"]')):
-                raise err
-            return err.rsp
+            # see if this is OK or just a warning; without a reply (e.g. a
+            # timeout) there is nothing to check
+            rsp = getattr(err, 'rsp', None)
+            if rsp is None or \
+                    len(rsp.xpath('.//error-severity[. = "error"]')):
+                raise
+            return rsp
 
         return result
 
@@ -842,3 +946,137 @@ class Resource(object):
             xml.append(E(element_name, E.name(this)))
         for this in dels:
             xml.append(E(element_name, JXML.DEL, E.name(this)))
+
+
+class WriteBatch(object):
+
+    """
+    Collects the changes of many resources and loads them in a single
+    load-configuration RPC, see :Resource.batch():.  Errors reported by
+    the load are mapped back to each resource by their edit path.
+    """
+
+    def __init__(self, mgr):
+        self._mgr = mgr
+        self._queue = []
+        self.errors = []
+
+    def __enter__(self):
+        self._mgr._batch = self
+        return self
+
+    def __exit__(self, exc_ty, exc_val, exc_tb):
+        self._mgr._batch = None
+        if exc_ty is None:
+            self.flush()
+        else:
+            self.discard()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def _add(self, res, xml, done, failed):
+        self._queue.append((res, xml, done, failed))
+
+    def discard(self):
+        """ drops the queued changes, without loading them """
+        queue, self._queue = self._queue, []
+        WriteBatch._failed(queue)
+
+    @classmethod
+    def _failed(klass, queue):
+        """ gives the :queue: resources their changes back """
+        for res, xml, done, failed in queue:
+            if failed is not None:
+                failed()
+
+    def flush(self):
+        """
+        loads the queued changes in one RPC.  Resources whose changes
+        loaded are updated as for an immediate write; the others keep
+        their changes in :should:.  When the load fails without a reply
+        to map back (e.g. a timeout), all of them keep their changes.
+
+        :returns: the RPC-reply, or :None: when nothing is queued
+
+        :raises ConfigLoadError: when the load reports errors.  Each error
+          of :errs: has a 'resource' key, the resource it belongs to or
+          :None: when it could not be mapped back.  They are also kept in
+          :errors:.
+        """
+        queue, self._queue = self._queue, []
+        if not queue:
+            return None
+
+        top = E.configuration()
+        for res, xml, done, failed in queue:
+            WriteBatch._merge(top, xml.getroottree().getroot())
+
+        err_rsp = None
+        rsp = None
+        try:
+            rsp = self._mgr._junos.rpc.load_config(top, action='replace')
+        except RpcError as err:
+            if err.rsp is None:
+                # no reply to map back, e.g. a timeout
+                WriteBatch._failed(queue)
+                raise
+            # see if this is OK or just a warning
+            if not len(err.rsp.xpath('.//error-severity[. = "error"]')):
+                rsp = err.rsp
+            else:
+                err_rsp = err.rsp
+        except Exception:
+            WriteBatch._failed(queue)
+            raise
+
+        self.errors = []
+        if err_rsp is not None:
+            paths = [(WriteBatch._edit_path(xml), res)
+                     for res, xml, done, failed in queue]
+            for rpc_err in err_rsp.xpath('descendant-or-self::rpc-error'):
+                this_err = JXML.rpc_error(rpc_err)
+                if this_err['severity'] != 'error':
+                    continue
+                this_err['resource'] = None
+                for path, res in paths:
+                    edit = this_err['edit_path'] or ''
+                    if edit == path or edit.startswith(path[:-1] + ' '):
+                        this_err['resource'] = res
+                        break
+                self.errors.append(this_err)
+
+        bad = [each['resource'] for each in self.errors]
+        for res, xml, done, failed in queue:
+            if res not in bad:
+                done()
+            elif failed is not None:
+                failed()
+
+        if self.errors:
+            raise ConfigLoadError(rsp=err_rsp, errs=self.errors)
+        return rsp
+
+    @classmethod
+    def _merge(klass, into, xml):
+        """
+        adds the :xml: element under :into:, sharing the enclosing
+        hierarchy elements that the changes have in common
+        """
+        if len(xml) and not xml.attrib:
+            for have in into.findall(xml.tag):
+                if not have.attrib and \
+                        have.findtext('name') == xml.findtext('name'):
+                    for child in xml:
+                        if child.tag != 'name':
+                            WriteBatch._merge(have, child)
+                    return
+        into.append(deepcopy(xml))
+
+    @classmethod
+    def _edit_path(klass, xml):
+        """ the "[edit ...]" path of a resource :xml: element """
+        stmts = [JXML._conf_stmt(ele)
+                 for ele in reversed(list(xml.iterancestors()))]
+        stmts.append(JXML._conf_stmt(xml))
+        return '[edit %s]' % ' '.join(stmts)
@@ -40,6 +40,9 @@ class User(Resource):
     def _xml_at_res(self, xml):
         return xml.find('.//user')
 
+    def _xml_at_all(self):
+        return E.system(E.login(E.user))
+
     def _xml_to_py(self, has_xml, has_py):
         Resource._r_has_xml_status(has_xml, has_py)
 
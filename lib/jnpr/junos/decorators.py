@@ -3,6 +3,14 @@ from functools import wraps
 
 from jnpr.junos.jxml import normalize_xslt
 
+"""
+  Kept for backwards compatibility with code that decorates its own
+  functions with these.  :meth:`Device.execute` no longer uses them, it
+  takes **dev_timeout** and **normalize** per call.  These decorators set
+  dev.timeout and dev.transform for the duration of the call, so they are
+  not safe to use from several threads sharing a Device.
+"""
+
 
 def timeoutDecorator(function):
     @wraps(function)
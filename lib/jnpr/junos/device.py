@@ -10,52 +10,15 @@ import datetime
 import time
 
 # 3rd-party packages
+# ncclient, paramiko and jinja2 are imported on first use, so that
+# 'import jnpr.junos' stays cheap for short-lived scripts
 from lxml import etree
-from ncclient import manager as netconf_ssh
-import ncclient.transport.errors as NcErrors
-import ncclient.operations.errors as NcOpErrors
-from ncclient.operations import RPCError
-import paramiko
-import jinja2
 
 # local modules
 from jnpr.junos.rpcmeta import _RpcMetaExec
 from jnpr.junos import exception as EzErrors
-from jnpr.junos.cfg import Resource
 from jnpr.junos.facts import *
 from jnpr.junos import jxml as JXML
-from jnpr.junos.decorators import timeoutDecorator, normalizeDecorator
-
-_MODULEPATH = os.path.dirname(__file__)
-
-
-class _MyTemplateLoader(jinja2.BaseLoader):
-
-    """
-    Create a jinja2 template loader class that can be used to
-    load templates from all over the filesystem, but defaults
-    to the CWD and the 'templates' directory of the module
-    """
-
-    def __init__(self):
-        self.paths = ['.', os.path.join(_MODULEPATH, 'templates')]
-
-    def get_source(self, environment, template):
-
-        def _in_path(dir):
-            return os.path.exists(os.path.join(dir, template))
-
-        path = filter(_in_path, self.paths)
-        if not path:
-            raise jinja2.TemplateNotFound(template)
-
-        path = os.path.join(path[0], template)
-        mtime = os.path.getmtime(path)
-        with file(path) as f:
-            source = f.read().decode('utf-8')
-        return source, path, lambda: mtime == os.path.getmtime(path)
-
-_Jinja2ldr = jinja2.Environment(loader=_MyTemplateLoader())
 
 
 class Device(object):
@@ -261,6 +224,7 @@ class Device(object):
         if not os.path.exists(sshconf_path):
             return None
         else:
+            import paramiko
             sshconf = paramiko.SSHConfig()
             sshconf.parse(open(sshconf_path, 'r'))
             found = sshconf.lookup(self._hostname)
@@ -359,7 +323,7 @@ class Device(object):
         # ------------------------------
 
         self._conn = None
-        self._j2ldr = _Jinja2ldr
+        self._j2ldr = None      # Jinja2 environment, loaded on first use
         self._manages = []
         self._facts = {}
 
@@ -411,6 +375,9 @@ class Device(object):
             and re-raised to the caller.
         """
 
+        from ncclient import manager as netconf_ssh
+        import ncclient.transport.errors as NcErrors
+
         auto_probe = kvargs.get('auto_probe', self._auto_probe)
         if auto_probe is not 0:
             if not self.probe(auto_probe):
@@ -502,8 +469,6 @@ class Device(object):
         self._conn.close_session()
         self.connected = False
 
-    @normalizeDecorator
-    @timeoutDecorator
     def execute(self, rpc_cmd, **kvargs):
         """
         Executes an XML RPC and returns results as either XML or native python
@@ -520,6 +485,18 @@ class Device(object):
 
             to_py( self, rpc_rsp, **kvargs )
 
+        :param int dev_timeout:
+          The RPC timeout (seconds) for this call only, by default the
+          device :attr:`timeout`
+
+        :param bool normalize:
+          Whether to normalize the whitespace of this reply, by default
+          as the device was opened
+
+        The device itself is not changed by **dev_timeout** or
+        **normalize**, so that several threads can execute RPCs on the
+        same device at once.
+
         :raises ValueError:
             When the **rpc_cmd** is of unknown origin
 
@@ -537,24 +514,74 @@ class Device(object):
             native python data-types (e.g. ``dict``).
         """
 
+        from jnpr.junos.future import RpcFuture
+
+        rpc_cmd_e = self._rpc_cmd(rpc_cmd)
+        timeout = kvargs.pop('dev_timeout', None)
+        normalize = kvargs.pop('normalize', None)
+        if timeout is None and normalize is None:
+            rpc_rsp_e = self._rpc_call(
+                rpc_cmd_e, lambda: self._conn.rpc(rpc_cmd_e)._NCElement__doc)
+        else:
+            # per-call options, handled on a request of their own rather
+            # than by changing the session settings other threads share
+            rpc_rsp_e = RpcFuture(self, rpc_cmd_e, timeout, normalize)._doc()
+        return self._rpc_reply(rpc_rsp_e, **kvargs)
+
+    def execute_async(self, rpc_cmd, timeout=None, normalize=None):
+        """
+        Sends an XML RPC and returns without waiting for the reply.  The
+        calling thread is free while the device works; the reply is
+        collected with :meth:`RpcFuture.result`, which returns and raises
+        just as :meth:`execute` does.  Many RPCs, to one or many devices,
+        can be outstanding at once.
+
+        :param rpc_cmd:
+          can either be an XML Element or xml-as-string, as for
+          :meth:`execute`
+
+        :param int timeout:
+          seconds to wait for the reply, counted from now.  By default
+          the device :attr:`timeout` is used.  The device :attr:`timeout`
+          itself is not changed.
+
+        :param bool normalize:
+          Whether to normalize the whitespace of the reply, by default as
+          the device was opened
+
+        :returns: :class:`jnpr.junos.future.RpcFuture`
+        """
+        from jnpr.junos.future import RpcFuture
+        return RpcFuture(self, self._rpc_cmd(rpc_cmd), timeout, normalize)
+
+    def _rpc_cmd(self, rpc_cmd):
         if self.connected is not True:
             raise EzErrors.ConnectClosedError(self)
 
         if isinstance(rpc_cmd, str):
-            rpc_cmd_e = etree.XML(rpc_cmd)
+            return etree.XML(rpc_cmd)
         elif isinstance(rpc_cmd, etree._Element):
-            rpc_cmd_e = rpc_cmd
+            return rpc_cmd
         else:
             raise ValueError(
                 "Dont know what to do with rpc of type %s" %
                 rpc_cmd.__class__.__name__)
 
+    def _rpc_call(self, rpc_cmd_e, call):
+        """
+          ~PRIVATE~ invokes :call: to obtain the <rpc-reply> of :rpc_cmd_e:,
+          translating the ncclient exceptions into jnpr.junos ones
+        """
+        import ncclient.transport.errors as NcErrors
+        import ncclient.operations.errors as NcOpErrors
+        from ncclient.operations import RPCError
+
         # invoking a bad RPC will cause a connection object exception
         # will will be raised directly to the caller ... for now ...
         # @@@ need to trap this and re-raise accordingly.
 
         try:
-            rpc_rsp_e = self._conn.rpc(rpc_cmd_e)._NCElement__doc
+            return call()
         except NcOpErrors.TimeoutExpiredError:
             # err is a TimeoutExpiredError from ncclient,
             # which has no such attribute as xml.
@@ -572,6 +599,11 @@ class Device(object):
             warnings.warn("An unknown exception occured - please report.", RuntimeWarning)
             raise
 
+    def _rpc_reply(self, rpc_rsp_e, **kvargs):
+        """
+          ~PRIVATE~ the value :meth:`execute` returns for :rpc_rsp_e:
+        """
+
         # This section is here for the possible use of something other than ncclient
         # for RPCs that have embedded rpc-errors, need to check for those now
 
@@ -682,6 +714,9 @@ class Device(object):
 
         :returns: Jinja2 :class:`Template` give **filename**.
         """
+        if self._j2ldr is None:
+            from jnpr.junos.utils.template import _Jinja2ldr
+            self._j2ldr = _Jinja2ldr
 
         return self._j2ldr.get_template(filename, parent, gvars)
 
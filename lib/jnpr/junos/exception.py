@@ -133,6 +133,27 @@ class SwRollbackError(RpcError):
     __str__ = __repr__
 
 
+class FleetError(Exception):
+    """
+    Generated when a configuration change across many devices fails on
+    one or more of them.
+    """
+    def __init__(self, phase, errs):
+        """
+          :phase: is the step that failed, e.g. 'load' or 'commit'
+          :errs: is a dict of hostname to the exception raised there
+        """
+        self.phase = phase
+        self.errs = errs
+
+    def __repr__(self):
+        return "{0}(phase: {1}, failed: {2})"\
+            .format(self.__class__.__name__, self.phase,
+                    ', '.join(sorted(self.errs)))
+
+    __str__ = __repr__
+
+
 # ================================================================
 # ================================================================
 #                    Connection Exceptions
@@ -1,12 +1,62 @@
 import yaml
 import os.path
+import hashlib
+import tempfile
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 from jnpr.junos.factory.factory_loader import FactoryLoader
+from jnpr.junos.utils.util import cache_dir
+from jnpr.junos.version import VERSION
 
 __all__ = ['loadyaml', 'FactoryLoader']
 
 
-def loadyaml(path):
+def _yaml_cache_key(path):
+    """ the YAML file is re-parsed when any of these change """
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime, st.st_size, VERSION)
+
+
+def _yaml_cached(path):
+    """
+    returns the parsed YAML data of the file at :path:, using the copy in
+    the local cache when the file has not changed since it was parsed.
+    the cache is best-effort; any problem with it falls back to parsing.
+    """
+    cdir = cache_dir('yaml')
+    if cdir is None:
+        return yaml.load(open(path, 'r'))
+
+    key = _yaml_cache_key(path)
+    cpath = os.path.join(cdir, hashlib.sha1(key[0]).hexdigest() + '.pkl')
+
+    try:
+        with open(cpath, 'rb') as f:
+            got_key, data = pickle.load(f)
+        if got_key == key:
+            return data
+    except Exception:
+        pass
+
+    data = yaml.load(open(path, 'r'))
+
+    try:
+        # write to a temp file first, so concurrent readers never see a
+        # partial cache file
+        fd, tmp = tempfile.mkstemp(dir=cdir)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, data), f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp, cpath)
+    except Exception:
+        pass
+
+    return data
+
+
+def loadyaml(path, cache=True):
     """
     Load a YAML file at :path: that contains Table and View definitions.
     Returns a <dict> of item-name anditem-class definition.
@@ -26,8 +76,15 @@ def loadyaml(path):
       table = MyTable(dev)
       table.get()
       ...
+
+    The parsed YAML data is kept in the local cache (see
+    :func:`jnpr.junos.utils.util.cache_dir`) keyed by the file path,
+    modification time, size and library version, so the YAML parser only
+    runs when the file changes.  Use :cache: = False to always parse.
     """
     # if no extension is given, default to '.yml'
     if os.path.splitext(path)[1] == '':
         path += '.yml'
+    if cache is True:
+        return FactoryLoader().load(_yaml_cached(path))
     return FactoryLoader().load(yaml.load(open(path, 'r')))
@@ -5,6 +5,7 @@ from lxml import etree
 from lxml.builder import E
 from jnpr.junos.factory.table import Table
 from jnpr.junos import jxml
+from jnpr.junos.utils.snapshot import ConfigSnapshot
 
 
 class CfgTable(Table):
@@ -13,9 +14,17 @@ class CfgTable(Table):
     # CONSTRUCTOR
     # -----------------------------------------------------------------------
 
-    def __init__(self, dev=None, xml=None, path=None):
+    def __init__(self, dev=None, xml=None, path=None, snapshot=None):
+        """
+        :snapshot: ConfigSnapshot (or <configuration> element) that
+                   :get(): retrieves from, rather than the device
+        """
         Table.__init__(self, dev, xml, path)       # call parent constructor
 
+        if snapshot is not None and not isinstance(snapshot, ConfigSnapshot):
+            snapshot = ConfigSnapshot(snapshot)
+        self._snapshot = snapshot
+
         self._data_dict = self.DEFINE  # crutch
         self.ITEM_NAME_XPATH = self._data_dict.get('key', 'name')
         self.ITEM_XPATH = self._data_dict['get']
@@ -158,6 +167,10 @@ class CfgTable(Table):
         :param dict options:
           *OPTIONAL* options to pass to get-configuration.  By default
           {'inherit': 'inherit', 'groups': 'groups'} is sent.
+
+        When the table is bound to a snapshot, the data is selected from
+        the snapshot instead; *namesonly* and *options* then have no
+        effect, the snapshot is used as it was fetched.
         """
         if self._lxml is not None:
             return self
@@ -192,6 +205,7 @@ class CfgTable(Table):
         if self.keys_required is True:
             self._encode_requiredkeys(get_cmd, kvargs)
 
+        named_xpath = ''
         try:
             # see if the caller provided a named item.  this must
             # be an actual name of a thing, and not an index number.
@@ -199,6 +213,8 @@ class CfgTable(Table):
             named_item = kvargs.get('key') or vargs[0]
             dot = get_cmd.find(self._data_dict['get'])
             self._encode_namekey(get_cmd, dot, named_item)
+            named_xpath = self._grindxpath(
+                self._data_dict.get('key', 'name'), named_item)
 
             if 'get_fields' in self._data_dict:
                 self._encode_getfields(get_cmd, dot)
@@ -221,8 +237,11 @@ class CfgTable(Table):
         self._get_opt = options
 
         # retrieve the XML configuration
+        # Check to see if bound to a local snapshot
+        if self._snapshot is not None:
+            self.xml = self._snapshot.select(self._get_xpath + named_xpath)
         # Check to see if running on box
-        if self._dev.ON_JUNOS:
+        elif self._dev.ON_JUNOS:
             try:
                 from junos import Junos_Configuration
 
@@ -3,12 +3,22 @@ from inspect import isclass
 from time import time
 from datetime import datetime
 import os
+import zlib
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 # 3rd-party
 from lxml import etree
 
 _TSFMT = "%Y%m%d%H%M%S"
 
+# snapshot file header, followed by a zlib compressed pickle of the
+# snapshot <dict>.  bump the version if the <dict> layout changes.
+_SNAPSHOT_MAGIC = 'JSNP'
+_SNAPSHOT_VERSION = 1
+
 import json
 from jnpr.junos.factory.to_json import TableJSONEncoder
 
@@ -180,11 +190,59 @@ class Table(object):
         # @@@ perhaps this should raise an exception rather than just 'pass',??
         pass
 
+    # ------------------------------------------------------------------------
+    # View rows, used for bulk export
+    # ------------------------------------------------------------------------
+
+    def _view_rows(self, as_dict=False):
+        """
+        generator of tuple(name, values) for each table item, the same data
+        as :items(): with the sub-tables expanded into their own rows.  When
+        :as_dict: is True the values, and those of sub-tables, are <dict>
+        """
+        self._assert_data()
+        if self.view is None:
+            raise RuntimeError("Table '%s' does not have a View" %
+                               self.__class__.__name__)
+
+        for this in self.xml.xpath(self.ITEM_XPATH):
+            view = self.view(self, this)
+            values = []
+            for name, value in view.items():
+                if isinstance(value, Table):
+                    if value.view is None:
+                        value = value.keys()
+                    elif as_dict is True:
+                        value = dict((str(key), val)
+                                     for key, val in value._view_rows(True))
+                    else:
+                        value = list(value._view_rows())
+                values.append((name, value))
+            yield view.name, dict(values) if as_dict is True else values
+
     # ------------------------------------------------------------------------
     # savexml - saves the table XML to a local file
     # ------------------------------------------------------------------------
 
-    def savexml(self, path, hostname=False, timestamp=False, append=None):
+    def _fpath(self, path, hostname=False, timestamp=False, append=None):
+        """ returns the :path: with the (hostname,timestamp,append) add-ons """
+        fname, fext = os.path.splitext(path)
+
+        if hostname is True:
+            fname += "_%s" % self.D.hostname
+
+        if timestamp is not False:
+            tsfmt = _TSFMT if timestamp is True else timestamp
+            tsfmt_val = datetime.fromtimestamp(time()).strftime(tsfmt)
+            fname += "_%s" % tsfmt_val
+
+        if append is not None:
+            fname += "_%s" % append
+
+        return fname + fext
+
+    def savexml(self, path, hostname=False, timestamp=False, append=None,
+                compress=False):
         """
         Save a copy of the table XML data to a local file.  The name of the
         output file (:path:) can include the name of the Device host, the
@@ -212,22 +270,110 @@ class Table(object):
         :append:
           any <str> value that you'd like appended to the :path: value
           preceding the filename extension.
+
+        :compress:
+          if True, the XML is streamed through gzip as it is written and
+          ".gz" is added to the final file-path (unless already there).
+          if <int> it is used as the gzip compression level (1-9).
+          Tables can be re-loaded from the compressed file using the
+          :path: constructor argument, since lxml reads gzip transparently.
         """
-        fname, fext = os.path.splitext(path)
+        path = self._fpath(path, hostname, timestamp, append)
 
-        if hostname is True:
-            fname += "_%s" % self.D.hostname
+        if compress is not False:
+            if not path.endswith('.gz'):
+                path += '.gz'
+            level = 9 if compress is True else int(compress)
+            return etree.ElementTree(self.xml).write(path, compression=level)
 
-        if timestamp is not False:
-            tsfmt = _TSFMT if timestamp is True else timestamp
-            tsfmt_val = datetime.fromtimestamp(time()).strftime(tsfmt)
-            fname += "_%s" % tsfmt_val
+        return etree.ElementTree(self.xml).write(file(path, 'w'))
 
-        if append is not None:
-            fname += "_%s" % append
+    # ------------------------------------------------------------------------
+    # save_snapshot, load_snapshot - compact binary copy of the table data
+    # ------------------------------------------------------------------------
 
-        path = fname + fext
-        return etree.ElementTree(self.xml).write(file(path, 'w'))
+    def save_snapshot(self, path, hostname=False, timestamp=False,
+                      append=None, raw_xml=False):
+        """
+        Save the extracted table data to a local file in a compact binary
+        format.  Rather than the XML, the snapshot stores the list of keys
+        and one typed column of values per View field; this is a fraction
+        of the size of the XML and reloads without any XML processing.
+
+        The :path:, :hostname:, :timestamp: and :append: parameters are
+        the same as :savexml():
+
+        :raw_xml:
+          if True, a compressed copy of the table XML is attached to the
+          snapshot as well, so that :load_snapshot(): can restore a fully
+          functional Table (Views, sub-tables, xpath, etc.)
+
+        :returns: the final file-path of the snapshot
+        """
+        self._assert_data()
+        path = self._fpath(path, hostname, timestamp, append)
+
+        keys = self.keys()
+        fields = self.view.FIELDS.keys() if self.view is not None else []
+        columns = [[] for _ in fields]
+        if len(fields):
+            for _, values in self._view_rows():
+                for column, (_, value) in zip(columns, values):
+                    column.append(value)
+
+        snap = {
+            'table': self.__class__.__name__,
+            'hostname': self.D.hostname if self.D is not None else None,
+            'ts_epoc': int(time()),
+            'keys': keys,
+            'fields': fields,
+            'columns': columns,
+            'xml': None
+        }
+        if raw_xml is True:
+            snap['xml'] = zlib.compress(etree.tostring(self.xml))
+
+        with open(path, 'wb') as f:
+            f.write(_SNAPSHOT_MAGIC + chr(_SNAPSHOT_VERSION))
+            f.write(zlib.compress(pickle.dumps(snap, pickle.HIGHEST_PROTOCOL)))
+
+        return path
+
+    def load_snapshot(self, path):
+        """
+        Load a snapshot file created by :save_snapshot():
+
+        If the snapshot includes the raw XML, then the table XML is restored
+        as well; i.e. this table can then be used as if :get(): was called.
+
+        .. warning:: snapshots are pickled data, only load snapshot files
+                     from a trusted source.
+
+        :path:
+          file-path to the snapshot file on the local filesystem
+
+        :returns: list of tuple(name, values) for each table entry, the
+                  same structure as :items():
+        """
+        with open(path, 'rb') as f:
+            head = f.read(len(_SNAPSHOT_MAGIC) + 1)
+            if head[:-1] != _SNAPSHOT_MAGIC:
+                raise ValueError("Not a table snapshot file: '%s'" % path)
+            if ord(head[-1]) != _SNAPSHOT_VERSION:
+                raise ValueError("Unsupported snapshot version: %s" %
+                                 ord(head[-1]))
+            snap = pickle.loads(zlib.decompress(f.read()))
+
+        if snap['xml'] is not None:
+            self._clearkeys()
+            self.xml = etree.XML(zlib.decompress(snap['xml']))
+            self._key_list = snap['keys']
+
+        fields = snap['fields']
+        rows = zip(*snap['columns']) if len(fields) else \
+            [() for _ in snap['keys']]
+        return [(key, zip(fields, row))
+                for key, row in zip(snap['keys'], rows)]
 
     def to_json(self):
         """
@@ -235,6 +381,40 @@ class Table(object):
         """
         return json.dumps(self, cls=TableJSONEncoder)
 
+    def dump_json(self, fp, ndjson=True):
+        """
+        Write the Table contents as JSON to the file-like object :fp:, one
+        item at a time, rather than building the whole document in memory.
+
+        :fp:
+          file-like object with a write() method
+
+        :ndjson:
+          if True (default), writes one JSON object per line (NDJSON) for
+          each item, in the same form as :View.to_json():
+          if False, writes a single JSON object, same as :to_json():
+
+        :returns: the number of items written
+        """
+        count = 0
+        rows = self._view_rows(as_dict=True)
+
+        if ndjson is True:
+            for name, values in rows:
+                fp.write(json.dumps({str(name): values}))
+                fp.write('\n')
+                count += 1
+            return count
+
+        fp.write('{')
+        for name, values in rows:
+            if count:
+                fp.write(', ')
+            fp.write('%s: %s' % (json.dumps(str(name)), json.dumps(values)))
+            count += 1
+        fp.write('}')
+        return count
+
     # -------------------------------------------------------------------------
     # OVERLOADS
     # -------------------------------------------------------------------------
@@ -1,7 +1,6 @@
-from jnpr.junos.jxml import strip_comments_transform
+from jnpr.junos import jxml
 import json
 from lxml import etree
-from copy import deepcopy
 
 
 class TableJSONEncoder(json.JSONEncoder):
@@ -47,11 +46,8 @@ class PyEzJSONEncoder(json.JSONEncoder):
         if isinstance(obj, version_info):
             obj = obj.v_dict
         elif isinstance(obj, etree._Element):
-            def recursive_dict(element):
-                return element.tag, dict(map(recursive_dict, element)) or element.text
-            # JSON does not support comments - strip them
-            obj = strip_comments_transform(deepcopy(obj)).getroot()
-            _, obj = recursive_dict(obj)
+            # JSON does not support comments - to_dict skips them
+            obj = jxml.to_dict(obj)
         else:
             obj = super(PyEzJSONEncoder, self).default(obj)
         return obj
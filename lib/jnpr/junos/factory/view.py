@@ -7,6 +7,17 @@ import json
 from jnpr.junos.factory.viewfields import ViewFields
 from jnpr.junos.factory.to_json import TableViewJSONEncoder
 
+# the FIELDS xpath expressions, compiled once and shared by all the View
+# items rather than parsed again for each item and field
+_XPATHS = {}
+
+
+def _xpath(expr):
+    found = _XPATHS.get(expr)
+    if found is None:
+        found = _XPATHS[expr] = etree.XPath(expr)
+    return found
+
 
 class View(object):
 
@@ -221,11 +232,11 @@ class View(object):
         astype = item.get('astype', str)
         if 'group' in item:
             if item['group'] in self._groups:
-                found = self._groups[item['group']].xpath(item['xpath'])
+                found = _xpath(item['xpath'])(self._groups[item['group']])
             else:
                 return
         else:
-            found = self._xml.xpath(item['xpath'])
+            found = _xpath(item['xpath'])(self._xml)
 
         len_found = len(found)
 
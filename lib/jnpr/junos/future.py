@@ -0,0 +1,157 @@
+# stdlib
+from time import time
+
+# local modules
+from jnpr.junos import exception as EzErrors
+
+"""
+RPCs that are sent without blocking the caller, see
+:meth:`jnpr.junos.Device.execute_async`
+"""
+
+__all__ = ['RpcFuture', 'gather']
+
+
+class RpcFuture(object):
+
+    """
+    An RPC that has been sent to the device and whose reply is collected
+    later.  The reply is delivered by the NETCONF session, no thread is
+    dedicated to waiting for it.
+    """
+
+    def __init__(self, dev, rpc_cmd_e, timeout=None, normalize=None):
+        """
+        sends the RPC :rpc_cmd_e:, the reply is expected within
+        :timeout: seconds, by default the device timeout.  :normalize:
+        overrides the whitespace normalization of the device for the reply.
+        """
+        from ncclient.operations.third_party.juniper.rpc import ExecuteRpc
+
+        self._dev = dev
+        self.cmd = rpc_cmd_e
+        self.timeout = timeout or dev.timeout
+        self.started = time()
+        self._normalize = normalize
+        self._cancelled = False
+        self._op = ExecuteRpc(dev._conn._session,
+                              device_handler=dev._conn._device_handler,
+                              async=True,
+                              timeout=self.timeout,
+                              raise_mode=dev._conn.raise_mode)
+        dev._rpc_call(rpc_cmd_e, lambda: self._op.request(rpc_cmd_e))
+
+    @property
+    def elapsed(self):
+        """ seconds since the RPC was sent """
+        return time() - self.started
+
+    def done(self):
+        """
+        :returns: ``True`` once the reply has arrived, the timeout has
+                  expired or the future was cancelled; :meth:`result`
+                  then returns without waiting
+        """
+        return self._cancelled or self._op.event.isSet() or \
+            self.elapsed >= self.timeout
+
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Stops waiting for the reply.  The RPC is not withdrawn from the
+        device, which may still complete it.
+
+        :returns: ``False`` if the reply has already arrived
+        """
+        if self._op.event.isSet():
+            return False
+        self._cancelled = True
+        return True
+
+    def result(self, timeout=None):
+        """
+        Waits for the reply and returns it as :meth:`Device.execute` would.
+
+        :param int timeout: seconds to wait at most this time; the
+                            timeout of the RPC itself still applies
+
+        :raises RuntimeError: when the future was cancelled
+        :raises RpcTimeoutError: when the reply did not arrive in time
+        :raises: everything :meth:`Device.execute` raises
+        """
+        if self._cancelled:
+            raise RuntimeError("%s was cancelled" % self.cmd.tag)
+        return self._dev._rpc_reply(self._doc(timeout))
+
+    def _doc(self, timeout=None):
+        """ waits for, and returns, the <rpc-reply> """
+        wait = max(self.timeout - self.elapsed, 0)
+        if timeout is not None:
+            wait = min(wait, timeout)
+        self._op.event.wait(wait)
+        if not self._op.event.isSet():
+            raise EzErrors.RpcTimeoutError(self._dev, self.cmd.tag,
+                                           self.timeout if timeout is None
+                                           else timeout)
+        return self._dev._rpc_call(self.cmd, self._reply_doc)
+
+    def exception(self, timeout=None):
+        """
+        Waits as :meth:`result` does.
+
+        :returns: the exception :meth:`result` raises, or ``None``
+        """
+        try:
+            self.result(timeout)
+        except Exception as err:
+            return err
+        return None
+
+    def _reply_doc(self):
+        # the reply processing ncclient does for a synchronous RPC
+        from ncclient.operations import RaiseMode, RPCError
+        from ncclient.xml_ import NCElement, to_ele
+
+        op = self._op
+        if op.error is not None:
+            raise op.error
+        reply = op.reply
+        reply.parse()
+        handler = self._dev._conn._device_handler
+        if reply.error is not None and \
+                not handler.is_rpc_error_exempt(reply.error.message):
+            if op.raise_mode == RaiseMode.ALL or \
+                    (op.raise_mode == RaiseMode.ERRORS and
+                     reply.error.severity == 'error'):
+                if len(reply.errors) > 1:
+                    raise RPCError(to_ele(reply._raw), errs=reply.errors)
+                raise reply.error
+        if self._normalize is True:
+            transform = self._dev._norm_transform
+        elif self._normalize is False:
+            transform = self._dev._nc_transform
+        else:
+            transform = handler.transform_reply
+        return NCElement(reply, transform())._NCElement__doc
+
+
+def gather(futures, timeout=None):
+    """
+    Waits for all of the **futures**.
+
+    :param int timeout: seconds to wait at most for each of them; their
+                        own timeout still applies
+
+    :returns: list of the results, in the order of **futures**.  A future
+              that failed contributes its exception instead, so that one
+              failure does not hide the others.
+    """
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout))
+        except Exception as err:
+            results.append(err)
+    return results
@@ -1,5 +1,6 @@
-from ncclient import manager
-from ncclient.xml_ import NCElement
+import re
+from copy import deepcopy
+
 from lxml import etree
 
 """
@@ -81,8 +82,22 @@ conf_xslt = '''\
     </xsl:template>
   </xsl:stylesheet>'''
 
+
+class _LazyXSLT(object):
+    """
+    XSLT transform that is compiled on first use rather than at import
+    """
+    def __init__(self, xslt_root):
+        self._root = xslt_root
+        self._xslt = None
+
+    def __call__(self, *vargs, **kvargs):
+        if self._xslt is None:
+            self._xslt = etree.XSLT(self._root)
+        return self._xslt(*vargs, **kvargs)
+
 conf_xslt_root = etree.XML(conf_xslt)
-conf_transform = etree.XSLT(conf_xslt_root)
+conf_transform = _LazyXSLT(conf_xslt_root)
 
 
 normalize_xslt = '''\
@@ -129,7 +144,7 @@ strip_comments_xslt = '''\
 </xsl:stylesheet>'''
 
 strip_xslt_root = etree.XML(strip_comments_xslt)
-strip_comments_transform = etree.XSLT(strip_xslt_root)
+strip_comments_transform = _LazyXSLT(strip_xslt_root)
 
 
 def remove_namespaces(xml):
@@ -140,6 +155,282 @@ def remove_namespaces(xml):
     return xml
 
 
+def to_dict(xml, attrs=False):
+    """
+      convert an XML element into native python types in a single pass
+      over the tree; comments and processing-instructions are skipped,
+      nothing is copied.
+
+      * an element with child elements becomes a <dict> keyed by tag
+      * child tags that repeat become a <list> of values
+      * an element without child elements becomes its text (or None)
+
+      when :attrs: is True, the attributes are included as '@<name>' keys,
+      and the text of a leaf element with attributes as '#text'.
+
+      the return value is the converted value of :xml:, the tag of
+      :xml: itself is not included.
+    """
+    def _attrs(ele, value):
+        for name, a_value in ele.attrib.items():
+            value['@' + etree.QName(name).localname] = a_value
+        return value
+
+    def _text(ele):
+        text = ele.text
+        return text if text is None or text.strip() else None
+
+    def _convert(ele):
+        value = {}
+        for child in ele:
+            tag = child.tag
+            if not isinstance(tag, basestring):
+                continue                    # comment, PI, entity
+            this = _convert(child)
+            if tag not in value:
+                value[tag] = this
+            elif isinstance(value[tag], list):
+                value[tag].append(this)
+            else:
+                value[tag] = [value[tag], this]
+
+        if attrs is True and len(ele.attrib):
+            if not len(value):
+                value['#text'] = _text(ele)
+            return _attrs(ele, value)
+
+        return value or _text(ele)
+
+    return _convert(xml)
+
+
+def rpc_to_dict(dev, rpc_rsp, **kvargs):
+    """
+      :meth:`Device.execute` **to_py** function that converts the RPC
+      reply using :func:`to_dict`.  Include attributes by passing
+      ``attrs=True``.  For example::
+
+        dev.rpc(E('get-software-information'), to_py=jxml.rpc_to_dict)
+    """
+    return to_dict(rpc_rsp, attrs=kvargs.get('attrs', False))
+
+
+def _conf_children(ele):
+    return [c for c in ele if isinstance(c.tag, basestring) and
+            c.tag != 'name']
+
+
+def _conf_lists(*parents):
+    """
+      tags of the lists without a <name> key below :parents:, those that
+      repeat under one of them and hold children, e.g. the SRX zone
+      <policy> or the <route-filter> entries
+    """
+    lists = set()
+    for parent in parents:
+        seen = set()
+        for child in _conf_children(parent):
+            if child.tag in seen and len(_conf_children(child)):
+                lists.add(child.tag)
+            seen.add(child.tag)
+    return lists
+
+
+def _conf_ident(ele, lists=()):
+    """
+      the elements that identify a list entry: its <name>, or for a list in
+      :lists: its leading leaves (e.g. from-zone-name and to-zone-name)
+    """
+    name = ele.find('name')
+    if name is not None:
+        return [name]
+    if ele.tag not in lists:
+        return []
+    kids = _conf_children(ele)
+    ident = []
+    for child in kids:
+        if len(_conf_children(child)) or child.find('name') is not None:
+            break
+        ident.append(child)
+    return ident or kids[:1]
+
+
+def _conf_key(ele, lists=()):
+    """
+      identity of a configuration element among its siblings: list
+      entries by their identifiers (see _conf_ident), leaves by their
+      value, containers by tag
+    """
+    ident = _conf_ident(ele, lists)
+    if ident:
+        return (ele.tag,) + tuple((c.tag, c.findtext('name') or
+                                   (c.text or '').strip()) for c in ident)
+    if len(_conf_children(ele)):
+        return (ele.tag, None)
+    return (ele.tag, (ele.text or '').strip())
+
+
+def _conf_value(value):
+    if re.search(r'[\s;{}#]', value):
+        value = '"%s"' % value
+    return value
+
+
+def _conf_stmt(ele, lists=()):
+    """ the Junos text statement (without terminator) for an element """
+    if ele.find('name') is None and ele.tag in lists:
+        return ' '.join([ele.tag] + [_conf_stmt(c)
+                                     for c in _conf_ident(ele, lists)])
+    value = ele.findtext('name')
+    if value is None and not len(_conf_children(ele)):
+        value = (ele.text or '').strip()
+    if not value:
+        return ele.tag
+    return '%s %s' % (ele.tag, _conf_value(value))
+
+
+def conf_diff(old, new):
+    """
+      structured diff of two <configuration> trees.  List entries are
+      matched by <name> or, for lists without one, by their leading
+      leaves; leaves by value and containers by tag.  Element order and
+      attributes are not compared.
+
+      returns a list of (op, path, element), where op is '-' for an
+      element only in :old: or '+' for one only in :new:, and path is
+      the list of statements of the enclosing hierarchy, e.g.
+      ['system', 'login', 'user rick'].
+    """
+    changes = []
+
+    def _walk(a, b, path):
+        lists = _conf_lists(a, b)
+        a_kids = dict((_conf_key(c, lists), c) for c in _conf_children(a))
+        b_kids = dict((_conf_key(c, lists), c) for c in _conf_children(b))
+        for child in _conf_children(a):
+            if _conf_key(child, lists) not in b_kids:
+                changes.append(('-', path, child))
+        for child in _conf_children(b):
+            if _conf_key(child, lists) not in a_kids:
+                changes.append(('+', path, child))
+        # descend once this level is reported, so changes stay grouped
+        for child in _conf_children(b):
+            key = _conf_key(child, lists)
+            if key in a_kids and (len(_conf_children(child)) or
+                                  len(_conf_children(a_kids[key]))):
+                _walk(a_kids[key], child,
+                      path + [_conf_stmt(child, lists)])
+
+    _walk(old, new, [])
+    return changes
+
+
+def conf_text(ele, indent=0):
+    """
+      renders a configuration element in Junos text (curly-brace)
+      format, returns a list of lines.
+    """
+    pad = ' ' * indent
+    kids = _conf_children(ele)
+    if not kids:
+        return [pad + _conf_stmt(ele) + ';']
+    lines = [pad + _conf_stmt(ele) + ' {']
+    for child in kids:
+        lines.extend(conf_text(child, indent + 4))
+    lines.append(pad + '}')
+    return lines
+
+
+def conf_diff_text(changes):
+    """
+      renders the :func:`conf_diff` changes in the patch-format used by
+      the Junos "show | compare" command.
+
+      returns None when there are no changes.
+    """
+    if not changes:
+        return None
+    out = ['']
+    last = None
+    for op, path, ele in changes:
+        if path != last:
+            out.append('[edit%s]' % ''.join(' ' + p for p in path))
+            last = path
+        out.extend(op + '  ' + line for line in conf_text(ele))
+    out.append('')
+    return '\n'.join(out)
+
+
+def conf_delta(old, new):
+    """
+      the change that turns configuration :old: into :new:, as a
+      <configuration> to load with format xml and action "replace", which
+      merges what carries no attribute.  What is only in :new: is merged
+      as it is; what is only in :old: is sent with operation="delete",
+      list entries by their keys (see :func:`conf_diff`), and a leaf that
+      occurs once under its parent in both is changed by the merge alone.
+      An entry of a list without <name> that changed below its keys, such
+      as an SRX zone <policy>, is sent whole with replace="replace", so
+      that what it holds ends up in the desired order.  Element order is
+      not compared otherwise.
+
+      returns the <configuration> element, or None when there is no change
+    """
+    top = etree.Element(new.tag)
+
+    def _made(parent, ele, lists):
+        # the element of the delta for :ele:, made under :parent: on first
+        # use with the keys that select it
+        made = []
+
+        def _at():
+            if not made:
+                at = etree.SubElement(parent(), ele.tag)
+                for key in _conf_ident(ele, lists):
+                    at.append(deepcopy(key))
+                made.append(at)
+            return made[0]
+        return _at
+
+    def _leaf(ele):
+        return not len(_conf_children(ele)) and ele.find('name') is None
+
+    def _single(ele, parent):
+        return _leaf(ele) and len(parent.findall(ele.tag)) == 1
+
+    def _walk(a, b, at):
+        lists = _conf_lists(a, b)
+        a_kids = dict((_conf_key(c, lists), c) for c in _conf_children(a))
+        b_kids = dict((_conf_key(c, lists), c) for c in _conf_children(b))
+        for child in _conf_children(a):
+            if _conf_key(child, lists) in b_kids:
+                continue
+            if _single(child, a) and [c for c in b.findall(child.tag)
+                                      if _single(c, b)]:
+                continue                # changed by the merge
+            gone = etree.SubElement(at(), child.tag, operation='delete')
+            ident = _conf_ident(child, lists)
+            for key in ident:
+                gone.append(deepcopy(key))
+            if not ident and _leaf(child) and not _single(child, a):
+                gone.text = child.text  # one value of a leaf list
+        for child in _conf_children(b):
+            key = _conf_key(child, lists)
+            if key not in a_kids:
+                at().append(deepcopy(child))
+            elif child.tag in lists and child.find('name') is None:
+                if conf_diff(a_kids[key], child):
+                    whole = deepcopy(child)
+                    whole.set('replace', 'replace')
+                    at().append(whole)
+            elif len(_conf_children(child)) or \
+                    len(_conf_children(a_kids[key])):
+                _walk(a_kids[key], child, _made(at, child, lists))
+
+    _walk(old, new, lambda: top)
+    return top if len(top) else None
+
+
 def rpc_error(rpc_xml):
     """
       extract the various bits from an <rpc-error> element
@@ -166,6 +457,8 @@ def rpc_error(rpc_xml):
 
 def cscript_conf(reply):
     try:
+        from ncclient import manager
+        from ncclient.xml_ import NCElement
         device_params = {'name': 'junos'}
         device_handler = manager.make_device_handler(device_params)
         transform_reply = device_handler.transform_reply()
@@ -59,7 +59,16 @@ class _RpcMetaExec(object):
         format='text', then :contents: is a string containing Junos configuration in curly-brace/text format
 
         <otherwise> :contents: is XML structure
+
+        :dev_timeout: and :normalize: are passed to :junos:execute() rather
+        than set as attributes.
         """
+        dec_args = {}
+        for name in ['dev_timeout', 'normalize']:
+            if options.get(name) is not None:
+                dec_args[name] = options[name]
+            options.pop(name, None)
+
         rpc = E('load-configuration', options)
 
         if ('action' in options) and (options['action'] == 'set'):
@@ -73,7 +82,7 @@ class _RpcMetaExec(object):
             else:
                 rpc.append(contents)
 
-        return self._junos.execute(rpc)
+        return self._junos.execute(rpc, **dec_args)
 
     # -----------------------------------------------------------------------
     # cli
@@ -0,0 +1,234 @@
+# stdlib
+import threading
+from time import time
+
+# local modules
+from jnpr.junos.utils.config import Config
+
+"""
+Commit coalescing, many small changes committed together
+"""
+
+__all__ = ['CommitBatcher']
+
+
+class Change(object):
+
+    """
+    A change queued by :meth:`CommitBatcher.load`, used to find out when
+    and how it was committed.
+    """
+
+    def __init__(self, vargs, kvargs):
+        self.vargs = vargs
+        self.kvargs = kvargs
+        self.error = None
+        self._event = threading.Event()
+
+    def _finish(self, error=None):
+        self.error = error
+        self._event.set()
+
+    def done(self):
+        """
+        :returns: ``True`` once the change is committed or has failed
+        """
+        return self._event.isSet()
+
+    def wait(self, timeout=None):
+        """
+        Waits for the change to be committed.
+
+        :param int timeout: seconds to wait, by default without limit
+
+        :returns:
+            * ``True`` when the change is committed
+            * ``None`` if **timeout** expired first
+
+        :raises: the exception that failed the load or commit of this
+                 change, e.g. :class:`ConfigLoadError` or
+                 :class:`CommitError`
+        """
+        self._event.wait(timeout)
+        if not self._event.isSet():
+            return None
+        if self.error is not None:
+            raise self.error
+        return True
+
+
+class CommitBatcher(object):
+
+    """
+    Queues configuration changes for one device and commits them together,
+    once **window** seconds after the first queued change or as soon as
+    **max_changes** are queued, rather than one commit per change::
+
+        with CommitBatcher(dev, window=30, comment='controller') as batcher:
+            change = batcher.load('set interfaces ge-0/0/1 disable',
+                                  format='set')
+            ...
+            change.wait()
+
+    The changes are loaded one at a time, so a change that fails to load
+    fails alone.  If the commit fails, the changes of that batch are
+    committed one by one so that each gets its own result.  The device
+    must not be used for configuration by others while batches run.
+    """
+
+    def __init__(self, dev, window=10, max_changes=100, mode=None,
+                 **commit_args):
+        """
+        :param Device dev: the Device object
+
+        :param int window: seconds a change may wait for others
+
+        :param int max_changes: the most changes committed together
+
+        :param str mode: *OPTIONAL* the :class:`Config` session mode
+                         each batch is made in, e.g. 'private'
+
+        :param commit_args: passed to :meth:`Config.commit`,
+                            e.g. comment
+        """
+        self.window = window
+        self.max_changes = max_changes
+        self.commits = 0            # number of commits made
+        self._cu = Config(dev, mode=mode)
+        self._commit_args = commit_args
+        self._queue = []
+        self._since = None          # time the oldest queued change arrived
+        self._closed = False
+        self._cond = threading.Condition()
+        self._busy = threading.Lock()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    # queue changes
+    # -------------------------------------------------------------------------
+
+    def load(self, *vargs, **kvargs):
+        """
+        Queues a change, the arguments are those of :meth:`Config.load`.
+
+        :returns: :class:`Change`
+
+        :raises RuntimeError: When the batcher is closed
+        """
+        change = Change(vargs, kvargs)
+        self._cond.acquire()
+        try:
+            if self._closed is True:
+                raise RuntimeError("CommitBatcher is closed")
+            if not self._queue:
+                self._since = time()
+            self._queue.append(change)
+            self._cond.notify()
+        finally:
+            self._cond.release()
+        return change
+
+    def flush(self):
+        """
+        Commits the queued changes now, at most **max_changes** at a time.
+        """
+        while True:
+            self._cond.acquire()
+            try:
+                batch = self._queue[:self.max_changes]
+                del self._queue[:self.max_changes]
+                self._since = time() if self._queue else None
+            finally:
+                self._cond.release()
+            if not batch:
+                return
+            self._busy.acquire()
+            try:
+                with self._cu:
+                    self._apply(batch)
+            except Exception as err:
+                # the session could not be opened or closed
+                for change in batch:
+                    if not change.done():
+                        change._finish(err)
+            finally:
+                self._busy.release()
+
+    def close(self):
+        """
+        Commits the queued changes and stops the batcher.
+        """
+        self._cond.acquire()
+        try:
+            self._closed = True
+            self._cond.notify()
+        finally:
+            self._cond.release()
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_ty, exc_val, exc_tb):
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # -------------------------------------------------------------------------
+
+    def _run(self):
+        """ background thread, flushes when the window or size is reached """
+        while True:
+            self._cond.acquire()
+            try:
+                while not self._closed:
+                    if not self._queue:
+                        # nothing queued yet, or flush() took it all
+                        self._cond.wait()
+                        continue
+                    if len(self._queue) >= self.max_changes:
+                        break
+                    left = self._since + self.window - time()
+                    if left <= 0:
+                        break
+                    self._cond.wait(left)
+                if self._closed is True:
+                    return
+            finally:
+                self._cond.release()
+            self.flush()
+
+    def _apply(self, batch):
+        """ load and commit the changes of :batch: """
+        cu = self._cu
+        loaded = []
+        for change in batch:
+            try:
+                cu.load(*change.vargs, **change.kvargs)
+                loaded.append(change)
+            except Exception as err:
+                change._finish(err)
+                # discard what the failed load applied, keep the others
+                cu.rollback(0)
+                for prior in loaded:
+                    cu.load(*prior.vargs, **prior.kvargs)
+
+        if not loaded:
+            return
+        try:
+            cu.commit(**self._commit_args)
+            self.commits += 1
+        except Exception as err:
+            cu.rollback(0)
+            if len(loaded) == 1:
+                loaded[0]._finish(err)
+            else:
+                for change in loaded:
+                    self._apply([change])
+            return
+
+        for change in loaded:
+            change._finish()
@@ -0,0 +1,142 @@
+# stdlib
+import os
+import re
+from time import time, sleep
+
+# local modules
+from jnpr.junos.utils.fs import FS
+from jnpr.junos.utils.scp import SCP
+from jnpr.junos.utils.sw import SW
+from jnpr.junos.utils.fleet import _parallel
+
+"""
+Collection of files, e.g. logs and core files, from many devices
+"""
+
+__all__ = ['FleetCollect']
+
+
+def _throttle(rate):
+    """
+    an SCP progress call-back that sleeps as needed to keep each transfer
+    under :rate: bytes per second
+    """
+    began = [time()]
+
+    def _progress(path, total, sent):
+        if sent == 0:
+            began[0] = time()     # a new file
+            return
+        ahead = float(sent) / rate - (time() - began[0])
+        if ahead > 0:
+            sleep(ahead)
+
+    return _progress
+
+
+class FleetCollect(object):
+
+    """
+    Collects files from many devices at once.  On each device the
+    requested paths are archived (:meth:`FS.tgz`), the archives are
+    copied here (:class:`SCP`), their checksum is verified and they are
+    removed from the device::
+
+        collect = FleetCollect(devs, workers=20, rate=2 * 1024 * 1024)
+        got = collect.get(['/var/log/*', '/var/crash/*core*'], 'incident')
+        for hostname, err in collect.errors.items():
+            print hostname, err
+
+    A device that fails does not stop the others.  The devices must be
+    open.
+    """
+
+    def __init__(self, devs, workers=20, rate=None, remote_dir='/var/tmp'):
+        """
+        :param list devs: the Device objects
+        :param int workers: the number of devices worked on at a time
+        :param int rate: the most bytes per second copied from each device,
+                         by default not limited
+        :param str remote_dir: directory on the devices for the archives
+        """
+        self.devs = list(devs)
+        self.workers = workers
+        self.rate = rate
+        self.remote_dir = remote_dir
+        self.errors = {}
+
+    @classmethod
+    def _name(cls, path):
+        """ archive name for a remote path, e.g. 'var-log' for /var/log/* """
+        return re.sub(r'[^\w.]+', '-', path).strip('-') or 'root'
+
+    def get(self, paths, local_dir, progress=None):
+        """
+        Collects **paths** from all devices, into one directory per device
+        below **local_dir**, named by hostname.  Each path gives one
+        archive, e.g. ``<local_dir>/<hostname>/var-log.tgz`` for
+        '/var/log/*'.
+
+        :param list paths: file paths on the devices, may use wildcards
+        :param str local_dir: directory where the archives are stored
+        :param func progress: call-back function for progress updates,
+                              called as progress(dev, report)
+
+        :returns: dict of hostname to the list of local archive paths, for
+                  the devices that succeeded.  The others are in
+                  :attr:`errors`, a dict of hostname to the exception.
+        """
+        if isinstance(paths, basestring):
+            paths = [paths]
+
+        def _get(dev):
+            return self._get_dev(dev, paths, local_dir, progress)
+
+        results = _parallel(_get, self.devs, self.workers)
+        self.errors = dict((dev.hostname, err) for dev, got, err in results
+                           if err is not None)
+        return dict((dev.hostname, got) for dev, got, err in results
+                    if err is None)
+
+    def _get_dev(self, dev, paths, local_dir, progress):
+        def _progress(report):
+            if callable(progress):
+                progress(dev, report)
+
+        fs = FS(dev)
+        to_dir = os.path.join(local_dir, dev.hostname)
+        try:
+            os.makedirs(to_dir)
+        except OSError:
+            if not os.path.isdir(to_dir):
+                raise
+
+        got = []
+        for path in paths:
+            name = FleetCollect._name(path) + '.tgz'
+            remote_tgz = '%s/pyez-collect-%s' % (self.remote_dir, name)
+            local_tgz = os.path.join(to_dir, name)
+            try:
+                _progress('archiving %s to %s' % (path, remote_tgz))
+                rsp = fs.tgz(path, remote_tgz)
+                if rsp is not True:
+                    raise RuntimeError("unable to archive %s: %s" %
+                                       (path, rsp))
+                _progress('copying %s' % remote_tgz)
+                scpargs = {}
+                if self.rate:
+                    scpargs['progress'] = _throttle(self.rate)
+                with SCP(dev, **scpargs) as scp:
+                    scp.get(remote_tgz, local_tgz)
+                local_md5 = SW.local_md5(local_tgz, cache=False)
+                if fs.checksum(remote_tgz) != local_md5:
+                    os.remove(local_tgz)
+                    raise RuntimeError("checksum mismatch on %s" % remote_tgz)
+            finally:
+                try:
+                    fs.rm(remote_tgz)
+                except Exception:
+                    pass                # best effort, leave it behind
+            got.append(local_tgz)
+        _progress('collected %d archive(s)' % len(got))
+        return got
@@ -1,6 +1,11 @@
 # utils/config.py
 import os
 import re
+import gzip
+import shutil
+import tarfile
+import tempfile
+from copy import deepcopy
 
 # 3rd-party modules
 from lxml import etree
@@ -8,30 +13,237 @@ from ncclient.operations import RPCError
 
 # package modules
 from jnpr.junos.exception import *
+from jnpr.junos.future import RpcFuture
 from jnpr.junos import jxml as JXML
 from jnpr.junos.utils.util import Util
+from jnpr.junos.utils.snapshot import SnapshotStore, commit_revision
 
 """
 Configuration Utilities
 """
 
 
+def _format_byext(path):
+    """ determine the format style from the file extension """
+    ext = os.path.splitext(path)[1]
+    if ext == '.xml':
+        return 'xml'
+    if ext in ['.conf', '.text', '.txt']:
+        return 'text'
+    if ext in ['.set']:
+        return 'set'
+    raise ValueError("Unknown file contents from extension: %s" % ext)
+
+
+def _format_bycontent(rpc):
+    """ determine the format style using string regular expression """
+    if re.search(r'^\s*<.*>$', rpc, re.MULTILINE):
+        return 'xml'
+    elif re.search(r'^\s*(set|delete|replace|rename)\s', rpc):
+        return 'set'
+    elif re.search(r'^[a-z:]*\s*\w+\s+{', rpc, re.I) and \
+            re.search(r'.*}\s*$', rpc):
+        return 'text'
+    return None
+
+
+def _chunk_set(lines, size):
+    """ batches of at most :size: set commands """
+    chunk = []
+    for line in lines:
+        if not line.strip():
+            continue
+        chunk.append(line.rstrip('\n'))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _chunk_text(lines, size):
+    """
+    batches of text format lines, at least :size: lines each (except the
+    last), split only between top-level statements
+    """
+    chunk = []
+    depth = 0
+    for line in lines:
+        chunk.append(line.rstrip('\n'))
+        # braces within quoted strings or comments do not count
+        code = re.sub(r'"(\\.|[^"\\])*"', '', line)
+        if not code.lstrip().startswith('#'):
+            code = re.sub(r'/\*.*?\*/', '', code)
+            depth += code.count('{') - code.count('}')
+        if depth <= 0 and len(chunk) >= size:
+            yield chunk
+            chunk = []
+            depth = 0
+    if chunk:
+        yield chunk
+
+
+# attributes of an element that act on all that it holds
+_XML_OPERATIONS = ('replace', 'delete', 'operation')
+
+
+def _chunk_xml(conf, size):
+    """
+    batches of <configuration> holding at most :size: of the elements
+    found at the second level of :conf: (top-level elements without
+    children count as one).  A top-level element that carries an
+    operation attribute, e.g. replace="replace", is kept whole in one
+    batch, as repeating it in the next batch would undo the previous one.
+    """
+    top = None
+    count = 0
+    for section in conf:
+        if not isinstance(section.tag, basestring):
+            continue
+        items = [c for c in section if isinstance(c.tag, basestring)]
+        if [a for a in _XML_OPERATIONS if a in section.attrib]:
+            items = []
+        parent = None
+        for item in (items or [None]):
+            if top is None:
+                top = etree.Element(conf.tag, dict(conf.attrib))
+                parent = None
+            if item is None:
+                top.append(deepcopy(section))
+            else:
+                if parent is None:
+                    parent = etree.SubElement(top, section.tag,
+                                              dict(section.attrib))
+                parent.append(deepcopy(item))
+            count += 1
+            if count >= size:
+                yield top
+                top = None
+                count = 0
+    if top is not None:
+        yield top
+
+
 class Config(Util):
 
     """
     Overivew of Configuration Utilities:
 
     * :meth:`commit`: commit changes
+    * :meth:`commit_async`: start a commit without waiting for it
     * :meth:`commit_check`: perform the commit check operation
+    * :meth:`committed`: return the committed config, cached by revision
+    * :meth:`desired_delta`: return the change needed to reach a desired state
     * :meth:`diff`: return the diff string between running and candidate config
     * :meth:`load`: load changes into the candidate config
+    * :meth:`load_chunked`: load a large change in batches
+    * :meth:`load_desired`: load only the change to reach a desired state
     * :meth:`lock`: take an exclusive lock on the candidate config
     * :meth:`pdiff`: prints the diff string (debug/helper)
     * :meth:`rescue`: controls "rescue configuration"
+    * :meth:`retrieve`: copy the active config from the device as a file
+    * :meth:`revision`: return the revision of the committed config
     * :meth:`rollback`: perform the load rollback command
     * :meth:`unlock`: release the exclusive lock
+
+    A Config can also be used as a context manager that opens one of the
+    Junos configuration database sessions, so that several jobs can change
+    the same device at once without taking the global lock::
+
+        with Config(dev, mode='private') as cu:
+            cu.load('set system ntp server 10.1.1.1', format='set')
+            cu.commit()
+
+    * 'private': a private copy of the candidate, like "configure private";
+      uncommitted changes are discarded on exit
+    * 'exclusive': the shared candidate, locked, like "configure exclusive";
+      uncommitted changes are discarded on exit
+    * 'ephemeral': the default ephemeral database, or the instance given as
+      **ephemeral_instance**, like "configure ephemeral"; commit activates
+      the changes, but "commit confirmed" is not supported
     """
 
+    _MODES = ['private', 'exclusive', 'ephemeral']
+
+    def __init__(self, dev, store=None, mode=None, **kvargs):
+        """
+        :param Device dev: the Device object
+
+        :param SnapshotStore store:
+          *OPTIONAL* where :meth:`committed` keeps configurations.  By
+          default they are held in memory by this object.  The store is
+          compared with the candidate configuration, so it must be made
+          with options={}, without inheritance.
+
+        :param str mode:
+          *OPTIONAL* the configuration session opened when used as a
+          context manager: 'private', 'exclusive' or 'ephemeral'.
+
+        :param str ephemeral_instance:
+          *OPTIONAL* used with mode 'ephemeral', the name of a user-defined
+          ephemeral database instance.
+        """
+        if mode is not None and mode not in self._MODES:
+            raise ValueError("unsupported configuration mode: '%s'" % mode)
+        if kvargs.get('ephemeral_instance') and mode != 'ephemeral':
+            raise ValueError(
+                "ephemeral_instance can only be used with mode 'ephemeral'")
+
+        Util.__init__(self, dev)
+        self.store = store if store is not None \
+            else SnapshotStore(options={})
+        self.mode = mode
+        self._ephemeral_instance = kvargs.get('ephemeral_instance')
+
+    # ------------------------------------------------------------------------
+    # configuration sessions, as context manager
+    # ------------------------------------------------------------------------
+
+    def __enter__(self):
+        """
+        Opens the configuration session given by **mode**.
+
+        :raises LockError: When the session cannot be opened
+        """
+        if self.mode == 'exclusive':
+            self.lock()
+            return self
+
+        if self.mode == 'private':
+            rpc_args = {'private': True}
+        elif self._ephemeral_instance:
+            rpc_args = {'ephemeral_instance': self._ephemeral_instance}
+        elif self.mode == 'ephemeral':
+            rpc_args = {'ephemeral': True}
+        else:
+            return self
+
+        try:
+            self.rpc.open_configuration(**rpc_args)
+        except RpcError as err:
+            # e.g. "uncommitted changes will be discarded on exit"
+            if err.rpc_error is None or \
+                    err.rpc_error['severity'] != 'warning':
+                raise LockError(rsp=err.rsp)
+        return self
+
+    def __exit__(self, exc_ty, exc_val, exc_tb):
+        """
+        Closes the configuration session, discarding uncommitted changes.
+
+        :raises UnlockError: When the session cannot be closed
+        """
+        if self.mode == 'exclusive':
+            try:
+                self.rollback(0)
+            finally:
+                self.unlock()
+        elif self.mode is not None:
+            try:
+                self.rpc.close_configuration()
+            except RpcError as err:
+                raise UnlockError(rsp=err.rsp)
+
     # ------------------------------------------------------------------------
     # commit
     # ------------------------------------------------------------------------
@@ -71,6 +283,42 @@ class Config(Util):
             a RpcTimeoutError will be raised.  It is possible the commit
             was successful.  Manual verification may be required.
         """
+        rpc_varg, rpc_args = self._commit_args(kvargs)
+
+        # dbl-splat the rpc_args since we want to pass key/value to metaexec
+        # if there is a commit/check error, this will raise an execption
+
+        return self._commit_reply(
+            lambda: self.rpc.commit_configuration(*rpc_varg, **rpc_args),
+            kvargs.get('detail'))
+
+    def commit_async(self, **kvargs):
+        """
+        Starts a commit and returns without waiting for it to complete.
+        The calling thread is free while the device commits, so many
+        commits, e.g. one per device of a fleet, can be outstanding at
+        once::
+
+            futures = [Config(dev).commit_async(timeout=120) for dev in devs]
+            results = gather(futures)      # from jnpr.junos.future
+
+        The parameters are those of :meth:`commit`.  **timeout** applies to
+        this commit only, the device timeout is not changed.
+
+        :returns: :class:`CommitFuture`, whose ``result()`` returns and
+                  raises what :meth:`commit` would
+        """
+        rpc_varg, rpc_args = self._commit_args(kvargs)
+        timeout = rpc_args.pop('dev_timeout', None)
+        rpc = etree.Element('commit-configuration', *rpc_varg)
+        for arg_name, arg_value in rpc_args.items():
+            arg = etree.SubElement(rpc, arg_name)
+            if arg_value is not True:
+                arg.text = arg_value
+        return CommitFuture(self, rpc, timeout, kvargs.get('detail'))
+
+    def _commit_args(self, kvargs):
+        """ the RPC options and arguments of a commit, see :meth:`commit` """
         rpc_args = {}
 
         # if a comment is provided, then include that in the RPC
@@ -85,6 +333,9 @@ class Config(Util):
         # (confirm=<minutes>)
 
         confirm = kvargs.get('confirm')
+        if confirm and self.mode == 'ephemeral':
+            raise ValueError(
+                "commit confirmed is not supported in ephemeral mode")
         if confirm:
             rpc_args['confirmed'] = True
             confirm_val = str(confirm)
@@ -109,15 +360,18 @@ class Config(Util):
             rpc_args['full'] = True
 
         rpc_varg = []
-        detail = kvargs.get('detail')
-        if detail:
+        if kvargs.get('detail'):
             rpc_varg = [{'detail': 'detail'}]
 
-        # dbl-splat the rpc_args since we want to pass key/value to metaexec
-        # if there is a commit/check error, this will raise an execption
+        return rpc_varg, rpc_args
 
+    def _commit_reply(self, call, detail):
+        """
+        the result of a commit, from the <commit-configuration> reply that
+        :call: returns, see :meth:`commit`
+        """
         try:
-            rsp = self.rpc.commit_configuration(*rpc_varg, **rpc_args)
+            rsp = call()
         except RpcTimeoutError:
             raise
         except RpcError as err:        # jnpr.junos exception
@@ -174,13 +428,18 @@ class Config(Util):
     # show | compare rollback <number|0*>
     # -------------------------------------------------------------------------
 
-    def diff(self, rb_id=0):
+    def diff(self, rb_id=0, local=False):
         """
         Retrieve a diff (patch-format) report of the candidate config against
         either the current active config, or a different rollback.
 
         :param int rollback: rollback id [0..49]
 
+        :param bool local:
+          When ``True`` the diff against the active config is computed
+          here rather than on the device, see :meth:`local_diff`.  Only
+          rollback 0 can be used.
+
         :returns:
             * ``None`` if there is no difference
             * ascii-text (str) if there is a difference
@@ -189,6 +448,11 @@ class Config(Util):
         if rb_id < 0 or rb_id > 49:
             raise ValueError("Invalid rollback #" + str(rb_id))
 
+        if local is True:
+            if rb_id != 0:
+                raise ValueError("local diff requires rollback 0")
+            return self.local_diff()
+
         rsp = self.rpc.get_configuration(dict(
             compare='rollback', rollback=str(rb_id), format='text'
         ))
@@ -196,6 +460,61 @@ class Config(Util):
         diff_txt = rsp.find('configuration-output').text
         return None if diff_txt == "\n" else diff_txt
 
+    def revision(self):
+        """
+        Retrieve the revision of the committed configuration, see
+        :func:`jnpr.junos.utils.snapshot.commit_revision`.
+
+        :returns:
+            the commit time of the latest commit, in seconds since the
+            epoch (str), or ``None`` if there is no commit history
+        """
+        return commit_revision(self.dev)
+
+    def committed(self, revision=None):
+        """
+        Retrieve the committed configuration (XML).  Each revision is
+        fetched once and then kept in :attr:`store`, so asking again only
+        costs a :meth:`revision` call.
+
+        :param str revision:
+          A revision previously returned by :meth:`revision`.  When not
+          provided, the current revision is used.
+
+        :returns: <configuration> element
+
+        :raises: ValueError: When a revision other than the current one
+                             is requested and it is not stored.
+        """
+        return self.store.get(self.dev, revision)
+
+    def local_diff(self, old=None, new=None):
+        """
+        Compute a diff (patch-format) report between two configurations
+        here, using :func:`jnpr.junos.jxml.conf_diff`, rather than on the
+        device.
+
+        :param old:
+          A revision (str) of the committed configuration, see
+          :meth:`committed`, or a <configuration> element.  Defaults to
+          the current committed configuration.
+
+        :param new:
+          Same as **old**.  Defaults to the candidate configuration.
+
+        :returns:
+            * ``None`` if there is no difference
+            * ascii-text (str) if there is a difference
+        """
+        def _conf(which):
+            if which is None or isinstance(which, basestring):
+                return self.committed(which)
+            return which
+
+        old = _conf(old)
+        new = self.rpc.get_configuration() if new is None else _conf(new)
+        return JXML.conf_diff_text(JXML.conf_diff(old, new))
+
     def pdiff(self, rb_id=0):
         """
         Helper method that calls ``print`` on the diff (patch-format) between the
@@ -272,6 +591,24 @@ class Config(Util):
           Used in conjunction with the other template options.  This parameter
           contains a dictionary of variables to render into the template.
 
+        :param via_file:
+          When ``True``, the content is not sent inline: it is compressed
+          locally, copied with :class:`SCP` to a temporary file in
+          '/var/tmp' on the device and loaded from there, and the file is
+          removed afterwards.  Give a directory path (str) to use instead
+          of '/var/tmp'.  Much faster for large changes.
+
+        :param func progress:
+          Used in conjunction with **via_file**, the :class:`SCP` progress
+          call-back.
+
+        :param str rendered:
+          Used in conjunction with **template_path**.  The template output
+          already rendered elsewhere, for example by
+          :func:`jnpr.junos.utils.template.render_pool`; the template is
+          then not loaded, only its filename is used to determine the
+          format-style.
+
         :returns:
             RPC-reply as XML object.
 
@@ -298,17 +635,6 @@ class Config(Util):
         # private helpers ...
         # ---------------------------------------------------------------------
 
-        def _lformat_byext(path):
-            """ determine the format style from the file extension """
-            ext = os.path.splitext(path)[1]
-            if ext == '.xml':
-                return 'xml'
-            if ext in ['.conf', '.text', '.txt']:
-                return 'text'
-            if ext in ['.set']:
-                return 'set'
-            raise ValueError("Unknown file contents from extension: %s" % ext)
-
         def _lset_format(kvargs, rpc_xattrs):
             """ setup the kvargs/rpc_xattrs """
             # when format is given, setup the xml attrs appropriately
@@ -324,19 +650,20 @@ class Config(Util):
             """ setup the kvargs/rpc_xattrs based on path """
             if 'format' not in kvargs:
                 # we use the extension to determine the format
-                kvargs['format'] = _lformat_byext(path)
+                kvargs['format'] = _format_byext(path)
                 _lset_format(kvargs, rpc_xattrs)
 
         def _lset_from_rexp(rpc):
             """ setup the kvargs/rpc_xattrs using string regular expression """
-            if re.search(r'^\s*<.*>$', rpc, re.MULTILINE):
-                kvargs['format'] = 'xml'
-            elif re.search(r'^\s*(set|delete|replace|rename)\s', rpc):
-                kvargs['format'] = 'set'
-            elif re.search(r'^[a-z:]*\s*\w+\s+{', rpc, re.I) and re.search(r'.*}\s*$', rpc):
-                kvargs['format'] = 'text'
+            fmt = _format_bycontent(rpc)
+            if fmt is not None:
+                kvargs['format'] = fmt
 
         def try_load(rpc_contents, rpc_xattrs):
+            if kvargs.get('via_file'):
+                return self._load_via_file(rpc_contents, rpc_xattrs,
+                                           kvargs['via_file'],
+                                           kvargs.get('progress'))
             try:
                 got = self.rpc.load_config(rpc_contents, **rpc_xattrs)
             except RpcError as err:
@@ -401,8 +728,11 @@ class Config(Util):
 
         if 'template_path' in kvargs:
             path = kvargs['template_path']
-            template = self.dev.Template(path)
-            rpc_contents = template.render(kvargs.get('template_vars', {}))
+            if kvargs.get('rendered') is not None:
+                rpc_contents = kvargs['rendered']
+            else:
+                template = self.dev.Template(path)
+                rpc_contents = template.render(kvargs.get('template_vars', {}))
             _lset_fromfile(path)
             if rpc_xattrs['format'] == 'xml':
                 # covert the XML string into XML structure
@@ -432,6 +762,342 @@ class Config(Util):
 
         raise RuntimeError("Unhandled load request")
 
+    def _load_via_file(self, rpc_contents, rpc_xattrs, remote_dir,
+                       progress=None):
+        """
+        Loads the contents from a compressed file copied onto the device,
+        see the **via_file** option of :meth:`load`.
+        """
+        from jnpr.junos.utils.scp import SCP
+        from jnpr.junos.utils.fs import FS
+
+        if remote_dir is True:
+            remote_dir = '/var/tmp'
+
+        if rpc_xattrs.get('action') == 'set':
+            ext = '.set'
+        elif rpc_xattrs['format'] == 'text':
+            ext = '.conf'
+        else:
+            ext = '.xml'
+            if rpc_contents.tag != 'configuration':
+                top = etree.Element('configuration')
+                top.append(deepcopy(rpc_contents))
+                rpc_contents = top
+            rpc_contents = etree.tostring(rpc_contents)
+        if isinstance(rpc_contents, unicode):
+            rpc_contents = rpc_contents.encode('utf-8')
+
+        fd, local = tempfile.mkstemp(prefix='junos-eznc-', suffix=ext + '.gz')
+        os.close(fd)
+        remote = remote_dir.rstrip('/') + '/' + os.path.basename(local)
+        copied = False
+        try:
+            gz = gzip.open(local, 'wb')
+            try:
+                gz.write(rpc_contents)
+            finally:
+                gz.close()
+
+            with SCP(self._dev, progress=progress) as scp:
+                copied = True
+                scp.put(local, remote)
+
+            rpc_xattrs = dict(rpc_xattrs, url=remote)
+            try:
+                return self.rpc.load_configuration(rpc_xattrs)
+            except RpcError as err:
+                raise ConfigLoadError(cmd=err.cmd, rsp=err.rsp, errs=err.errs)
+        finally:
+            os.remove(local)
+            if copied is True:
+                try:
+                    FS(self._dev).rm(remote)
+                except Exception:
+                    pass                # best effort, leave it in /var/tmp
+
+    # -------------------------------------------------------------------------
+    # desired state
+    # -------------------------------------------------------------------------
+
+    def desired_delta(self, desired):
+        """
+        Compute the change that turns the committed configuration (see
+        :meth:`committed`) into the **desired** one, as XML to load with the
+        default 'replace' action, see :func:`jnpr.junos.jxml.conf_delta`.
+        Only the top-level hierarchies present in **desired** are compared,
+        each is brought to exactly the desired state; the others are left
+        as they are.
+
+        :param desired:
+          The desired configuration, as an XML object or string.
+
+        :returns: <configuration> XML object, ``None`` when there is no
+                  change
+        """
+        if isinstance(desired, basestring):
+            if _format_bycontent(desired) != 'xml':
+                raise ValueError("desired state must be XML")
+            desired = etree.XML(desired)
+        if desired.tag != 'configuration':
+            top = etree.Element('configuration')
+            top.append(deepcopy(desired))
+            desired = top
+
+        running = self.committed()
+        scope = set(section.tag for section in desired)
+        have = etree.Element('configuration')
+        for section in running:
+            if section.tag in scope:
+                have.append(deepcopy(section))
+        return JXML.conf_delta(have, desired)
+
+    def load_desired(self, desired):
+        """
+        Loads only the changes needed to reach the **desired** state, see
+        :meth:`desired_delta`, with format xml.
+
+        :returns:
+            * RPC-reply as XML object
+            * ``None`` when there is no change to load
+
+        :raises: ConfigLoadError: When errors detected while loading
+        """
+        delta = self.desired_delta(desired)
+        if delta is None:
+            return None
+        return self.load(delta, format='xml')
+
+    # -------------------------------------------------------------------------
+    # retrieve the active config as a file
+    # -------------------------------------------------------------------------
+
+    def retrieve(self, format='xml', remote_dir='/var/tmp', progress=None,
+                 inherit=None):
+        """
+        Retrieve the active configuration as a compressed file rather than
+        through get-configuration: the configuration is saved to a file on
+        the device, archived with :meth:`FS.tgz`, copied here with
+        :class:`SCP` and its checksum verified before it is parsed.  The
+        files are removed from the device afterwards.
+
+        .. warning:: REQUIRES SHELL PRIVILEGES
+
+        :param str format:
+          The configuration format, one of 'xml', 'text' or 'set'.
+
+        :param str remote_dir:
+          The directory on the device for the temporary files.
+
+        :param func progress:
+          The :class:`SCP` progress call-back.
+
+        :param str inherit:
+          *OPTIONAL* as the get-configuration option: 'inherit' to expand
+          the configuration groups, 'defaults' to also include the
+          inherited defaults.
+
+        :returns:
+            * <configuration> element for 'xml' format, usable by
+              :class:`ConfigSnapshot` and :class:`SnapshotStore`
+            * the configuration (str) otherwise
+
+        :raises: RuntimeError: When the configuration could not be saved,
+                               archived or verified.
+        """
+        from jnpr.junos.utils.start_shell import StartShell
+        from jnpr.junos.utils.scp import SCP
+        from jnpr.junos.utils.fs import FS
+        from jnpr.junos.utils.sw import SW
+
+        pipes = {'xml': ' | display xml', 'text': '', 'set': ' | display set'}
+        exts = {'xml': '.xml', 'text': '.conf', 'set': '.set'}
+        if format not in pipes:
+            raise ValueError("Unknown configuration format: '%s'" % format)
+        inherits = {None: '', 'inherit': ' | display inheritance',
+                    'defaults': ' | display inheritance defaults'}
+        if inherit not in inherits:
+            raise ValueError("Unknown inherit option: '%s'" % inherit)
+
+        fs = FS(self._dev)
+        local_dir = tempfile.mkdtemp(prefix='junos-eznc-')
+        name = os.path.basename(local_dir) + exts[format]
+        remote = remote_dir.rstrip('/') + '/' + name
+        remote_tgz = remote + '.tgz'
+        local_tgz = os.path.join(local_dir, name + '.tgz')
+        try:
+            with StartShell(self._dev) as sh:
+                sh.run("cli -c 'show configuration%s%s | save %s'" %
+                       (inherits[inherit], pipes[format], remote))
+                ok = sh.last_ok
+            if ok is not True:
+                raise RuntimeError("unable to save configuration to %s" %
+                                   remote)
+
+            rsp = fs.tgz(remote, remote_tgz)
+            if rsp is not True:
+                raise RuntimeError("unable to archive %s: %s" % (remote, rsp))
+
+            with SCP(self._dev, progress=progress) as scp:
+                scp.get(remote_tgz, local_tgz)
+
+            if fs.checksum(remote_tgz) != SW.local_md5(local_tgz, cache=False):
+                raise RuntimeError("checksum mismatch on %s" % remote_tgz)
+
+            tgz = tarfile.open(local_tgz)
+            try:
+                members = [m for m in tgz.getmembers() if m.isfile()]
+                if len(members) != 1:
+                    raise RuntimeError("unexpected contents in %s" %
+                                       remote_tgz)
+                data = tgz.extractfile(members[0]).read()
+            finally:
+                tgz.close()
+        finally:
+            shutil.rmtree(local_dir, ignore_errors=True)
+            for path in [remote, remote_tgz]:
+                try:
+                    fs.rm(path)
+                except Exception:
+                    pass                # best effort, leave it on the device
+
+        if format != 'xml':
+            return data
+
+        root = etree.XML(data)
+        conf = root if root.tag == 'configuration' \
+            else root.find('.//configuration')
+        if conf is None:
+            raise RuntimeError("no configuration found in %s" % remote)
+        return conf
+
+    def load_chunked(self, *vargs, **kvargs):
+        """
+        Loads a large configuration into the candidate in batches, one
+        ``load-configuration`` RPC per batch, so that no single RPC has to
+        carry the whole change.  Set and text files are read as they are
+        loaded rather than all at once.
+
+        :param object vargs[0]:
+            The content to load, as for :meth:`load`.
+
+        :param str path:
+            Path to a file containing the content to load.
+
+        :param str format:
+          Determines the format of the contents, one of 'set', 'text' or
+          'xml'.  By default it is determined from the **path** extension
+          or from the contents, as for :meth:`load`.
+
+        :param int chunk_size:
+          The number of set commands, text lines or XML elements (those
+          at the second level of <configuration>) in each batch; default
+          5000.  Text batches are only split between top-level
+          statements, so can be longer.
+
+        :param bool overwrite:
+          Replace the complete configuration: the first batch is loaded
+          with 'override' and the rest are merged into it.  Cannot be
+          used with 'set' format.
+
+        :param bool merge:
+          Merge the contents rather than using the default 'replace'.
+
+        :param int timeout:
+          The RPC timeout (seconds) for each batch.  By default the device
+          timeout is used.
+
+        :param func progress:
+          call-back function(dev, report) called after each batch.
+
+        :returns:
+            The number of batches loaded.
+
+        :raises: ConfigLoadError: After all batches were tried, when any of
+                             them failed.  The Exception errs variable is a
+                             list of the errors, each with the index of the
+                             batch as 'chunk'.
+        """
+        chunk_size = kvargs.get('chunk_size', 5000)
+        overwrite = kvargs.get('overwrite', False)
+        progress = kvargs.get('progress')
+        path = kvargs.get('path')
+
+        fmt = kvargs.get('format')
+        if fmt is None:
+            if path is not None:
+                fmt = _format_byext(path)
+            elif len(vargs) and isinstance(vargs[0], basestring):
+                fmt = _format_bycontent(vargs[0])
+            elif len(vargs):
+                fmt = 'xml'
+            if fmt is None:
+                raise RuntimeError(
+                    "Not able to resolve the config format "
+                    "You must define the format of the contents explicitly "
+                    "to the function. Ex: format='set'")
+
+        rpc_xattrs = {'format': 'text' if fmt == 'set' else fmt}
+        if fmt == 'set':
+            if overwrite is True:
+                raise ValueError(
+                    "conflicting args, cannot use 'set' with 'overwrite'")
+            rpc_xattrs['action'] = 'set'
+        elif overwrite is True:
+            rpc_xattrs['action'] = 'override'
+        elif kvargs.get('merge') is not True:
+            rpc_xattrs['action'] = 'replace'
+        if kvargs.get('timeout'):
+            rpc_xattrs['dev_timeout'] = kvargs['timeout']
+
+        source = None
+        if fmt == 'xml':
+            if path is not None:
+                contents = etree.parse(path).getroot()
+            elif isinstance(vargs[0], basestring):
+                contents = etree.XML(vargs[0])
+            else:
+                contents = vargs[0]
+            chunks = _chunk_xml(contents, chunk_size)
+        else:
+            if path is not None:
+                source = open(path, 'rU')
+                lines = source
+            else:
+                lines = vargs[0].splitlines()
+            chunker = _chunk_set if fmt == 'set' else _chunk_text
+            chunks = ('\n'.join(chunk)
+                      for chunk in chunker(lines, chunk_size))
+
+        errs = []
+        first_err = None
+        loaded = 0
+        try:
+            for index, chunk in enumerate(chunks):
+                attrs = dict(rpc_xattrs)
+                if index and attrs.get('action') == 'override':
+                    del attrs['action']         # merge into the first
+                try:
+                    self.rpc.load_config(chunk, **attrs)
+                except RpcError as err:
+                    first_err = first_err or err
+                    this_err = dict(err.rpc_error or {})
+                    this_err['chunk'] = index
+                    errs.append(this_err)
+                loaded = index + 1
+                if callable(progress):
+                    progress(self._dev, "loaded batch %d%s" % (
+                        loaded, ' (errors)' if errs and
+                        errs[-1]['chunk'] == index else ''))
+        finally:
+            if source is not None:
+                source.close()
+
+        if first_err is not None:
+            raise ConfigLoadError(rsp=first_err.rsp, cmd=first_err.cmd,
+                                  errs=errs)
+        return loaded
+
     # -------------------------------------------------------------------------
     # config exclusive
     # -------------------------------------------------------------------------
@@ -607,3 +1273,21 @@ class Config(Util):
         }.get(action, _unsupported_action)()
 
         return result
+
+
+class CommitFuture(RpcFuture):
+
+    """
+    A commit started by :meth:`Config.commit_async`.  :meth:`result`
+    returns ``True``, or the commit detail XML, and raises
+    :class:`CommitError` just as :meth:`Config.commit` does.
+    """
+
+    def __init__(self, config, rpc_cmd_e, timeout=None, detail=False):
+        RpcFuture.__init__(self, config._dev, rpc_cmd_e, timeout)
+        self._config = config
+        self._detail = detail
+
+    def result(self, timeout=None):
+        return self._config._commit_reply(
+            lambda: RpcFuture.result(self, timeout), self._detail)
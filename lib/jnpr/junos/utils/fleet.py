@@ -0,0 +1,237 @@
+# stdlib
+from multiprocessing.pool import ThreadPool
+
+# local modules
+from jnpr.junos.utils.config import Config
+from jnpr.junos.exception import FleetError
+
+"""
+Configuration changes across many devices
+"""
+
+__all__ = ['FleetConfig']
+
+
+def _parallel(func, items, workers):
+    """
+    calls :func: for each of :items: using up to :workers: threads,
+    returns a list of (item, result, exception) in the order of :items:
+    """
+    def _call(item):
+        try:
+            return (item, func(item), None)
+        except Exception as err:
+            return (item, None, err)
+
+    if not items:
+        return []
+    pool = ThreadPool(max(1, min(workers, len(items))))
+    try:
+        return pool.map(_call, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+class FleetConfig(object):
+
+    """
+    Coordinates one configuration change across many devices, with each
+    step run in parallel on all of them and no device committing unless
+    all of them loaded and checked the change.  For example::
+
+        fleet = FleetConfig(devs)
+        fleet.load(path='ntp.set')      # lock + load, on all devices
+        fleet.commit_check()
+        fleet.commit(confirm=5, workers=20)
+        # ... verify the devices ...
+        fleet.confirm()
+
+    or, all at once, ``fleet.push(path='ntp.set', confirm=5)``.
+
+    If any device fails before commit, the change is rolled back and the
+    configuration unlocked on all devices, and :class:`FleetError` is
+    raised.  The devices must be open.
+
+    * :meth:`load`: lock and load the change on all devices
+    * :meth:`commit_check`: commit check on all devices
+    * :meth:`commit`: commit on all devices, with bounded concurrency
+    * :meth:`confirm`: confirm a commit made with **confirm**
+    * :meth:`abort`: rollback and unlock all devices
+    * :meth:`push`: all of the above
+    """
+
+    def __init__(self, devs, workers=50):
+        """
+        :param list devs: the Device objects
+        :param int workers: the number of devices worked on at a time
+        """
+        self.devs = list(devs)
+        self.workers = workers
+        self._cu = [(dev, Config(dev)) for dev in self.devs]
+        self._locked = []           # (dev, Config) holding a lock
+        self._committed = []        # (dev, Config) committed, not unlocked
+
+    def _fail(self, phase, results):
+        errs = dict((dev.hostname, err) for (dev, cu), got, err in results
+                    if err is not None)
+        if errs:
+            self.abort()
+            raise FleetError(phase, errs)
+        return dict((dev.hostname, got) for (dev, cu), got, err in results)
+
+    # -------------------------------------------------------------------------
+    # load
+    # -------------------------------------------------------------------------
+
+    def load(self, *vargs, **kvargs):
+        """
+        Locks the candidate configuration and loads the change on all
+        devices.  The arguments are those of :meth:`Config.load`.
+
+        :returns: dict of hostname to the load RPC-reply
+
+        :raises FleetError: When any device could not be locked or loaded,
+                            after all devices are rolled back and unlocked.
+        """
+        def _lock_load(item):
+            dev, cu = item
+            cu.lock()
+            self._locked.append(item)
+            return cu.load(*vargs, **kvargs)
+
+        return self._fail('load', _parallel(_lock_load, self._cu,
+                                            self.workers))
+
+    # -------------------------------------------------------------------------
+    # commit check
+    # -------------------------------------------------------------------------
+
+    def commit_check(self):
+        """
+        Performs a commit check on all devices.
+
+        :returns: dict of hostname to ``True``
+
+        :raises FleetError: When any device fails the check, after all
+                            devices are rolled back and unlocked.
+        """
+        def _check(item):
+            got = item[1].commit_check()
+            if got is not True:
+                raise RuntimeError(got)
+            return got
+
+        return self._fail('commit_check', _parallel(_check, self._locked,
+                                                    self.workers))
+
+    # -------------------------------------------------------------------------
+    # commit
+    # -------------------------------------------------------------------------
+
+    def commit(self, workers=None, **kvargs):
+        """
+        Commits on all devices, at most **workers** at a time.  The
+        arguments are those of :meth:`Config.commit`.  When **confirm** is
+        given the devices stay locked until :meth:`confirm`, and revert
+        by themselves unless confirmed in time.
+
+        :param int workers: the number of commits run at a time, defaults
+                            to the number given to the constructor
+
+        :returns: dict of hostname to the commit result
+
+        :raises FleetError: When any device fails to commit.  No commit
+                            is started after that; the devices not yet
+                            committed are rolled back (they are listed in
+                            its errs as RuntimeError), and all are
+                            unlocked.  With **confirm** the committed ones
+                            revert by themselves.
+        """
+        failed = []
+
+        def _commit(item):
+            if failed:
+                raise RuntimeError("not committed, another device failed")
+            try:
+                got = item[1].commit(**kvargs)
+            except Exception:
+                failed.append(item)
+                raise
+            self._locked.remove(item)
+            self._committed.append(item)
+            return got
+
+        results = _parallel(_commit, list(self._locked),
+                            workers or self.workers)
+        if failed or not kvargs.get('confirm'):
+            self._unlock(self._committed)
+        return self._fail('commit', results)
+
+    def confirm(self, comment=None):
+        """
+        Confirms the commit made by :meth:`commit` with **confirm** on
+        all devices, and unlocks them.
+
+        :param str comment: logged with the confirming commit
+
+        :returns: dict of hostname to ``True``
+
+        :raises FleetError: When any device fails to confirm.
+        """
+        def _confirm(item):
+            return item[1].commit(comment=comment)
+
+        results = _parallel(_confirm, self._committed, self.workers)
+        self._unlock(self._committed)
+        return self._fail('confirm', results)
+
+    # -------------------------------------------------------------------------
+    # abort
+    # -------------------------------------------------------------------------
+
+    def _unlock(self, items):
+        def _unlock(item):
+            item[1].unlock()
+
+        _parallel(_unlock, items, self.workers)
+        del items[:]
+
+    def abort(self):
+        """
+        Rolls back the candidate configuration and unlocks it on all
+        devices still holding a lock.  Errors are ignored.
+        """
+        def _rollback(item):
+            item[1].rollback(0)
+
+        _parallel(_rollback, self._locked, self.workers)
+        self._unlock(self._locked)
+
+    # -------------------------------------------------------------------------
+    # push
+    # -------------------------------------------------------------------------
+
+    def push(self, *vargs, **kvargs):
+        """
+        Runs :meth:`load`, :meth:`commit_check` and :meth:`commit` in turn.
+        The arguments are those of :meth:`Config.load`, and in addition:
+
+        :param int confirm: commit confirmed with this timeout (minutes),
+                            the caller must then call :meth:`confirm`
+        :param str comment: logged with the commit
+        :param int commit_workers: the number of commits run at a time
+
+        :returns: dict of hostname to the commit result
+
+        :raises FleetError: see the individual steps
+        """
+        commit_args = {}
+        for name in ['confirm', 'comment']:
+            if kvargs.get(name) is not None:
+                commit_args[name] = kvargs.pop(name)
+        workers = kvargs.pop('commit_workers', None)
+
+        self.load(*vargs, **kvargs)
+        self.commit_check()
+        return self.commit(workers=workers, **commit_args)
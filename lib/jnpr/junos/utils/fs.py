@@ -1,8 +1,12 @@
+from itertools import imap
+
 from lxml.builder import E
 
 from jnpr.junos.utils.util import Util
 from jnpr.junos.utils.start_shell import StartShell
 
+_READ_CHUNK = 32768
+
 
 class FS(Util):
     """
@@ -12,8 +16,10 @@ class FS(Util):
     * :meth:`checksum`: calculate file checksum (md5,sha256,sha1)
     * :meth:`cp`: local file copy (not scp)
     * :meth:`cwd`: change working directory
+    * :meth:`iter_ls`: iterate over a directory listing, one file at a time
     * :meth:`ls`: return file/dir listing
     * :meth:`mkdir`: create a directory
+    * :meth:`open_read`: read a large file over SFTP, in chunks or ranges
     * :meth:`pwd`: get working directory
     * :meth:`mv`: local file rename
     * :meth:`rm`: local file delete
@@ -24,6 +30,7 @@ class FS(Util):
     * :meth:`storage_cleanup_check`: returns a list of files to remove at cleanup
     * :meth:`symlink`: create a symlink
     * :meth:`tgz`: tar+gzip a directory
+    * :meth:`walk`: iterate over a directory tree
 
     .. note: The following methods require 'start shell' priveldges:
 
@@ -50,6 +57,38 @@ class FS(Util):
             return None
         return rsp.text
 
+    # -------------------------------------------------------------------------
+    # open_read - read a file over SFTP
+    # -------------------------------------------------------------------------
+
+    def open_read(self, path, offset=0, length=None, chunk_size=_READ_CHUNK):
+        """
+        Opens the file **path** for reading over SFTP, rather than as the
+        contents of a ``file-show`` RPC reply as :meth:`cat` does, so that
+        large files are neither wrapped in XML nor held in memory at once.
+        The returned :class:`RemoteFile` is used as a context manager and
+        iterated over in chunks, or read with ``read()``::
+
+            with fs.open_read('/var/log/messages', offset=last) as log:
+                for chunk in log:
+                    out.write(chunk)
+                last = log.position
+
+        :param str path: file-path on the device
+        :param int offset:
+          where to start reading, in bytes.  A negative value counts from
+          the end of the file, e.g. -65536 for the last 64KB
+        :param int length: read at most this many bytes, by default up to
+          the end of the file
+        :param int chunk_size: size of the chunks when iterating
+
+        .. note:: This method uses the same credentials and connection
+                  settings as :class:`jnpr.junos.utils.scp.SCP`.
+
+        :returns: :class:`RemoteFile`
+        """
+        return RemoteFile(self._dev, path, offset, length, chunk_size)
+
     # -------------------------------------------------------------------------
     # cwd - change working directory
     # -------------------------------------------------------------------------
@@ -139,7 +178,7 @@ class FS(Util):
         if files is None:
             files = dirinfo.xpath('file-information')
         results['file_count'] = len(files)
-        results['size'] = sum([int(f.findtext('file-size')) for f in files])
+        results['size'] = sum(int(f.findtext('file-size')) for f in files)
         return results
 
     # -------------------------------------------------------------------------
@@ -231,6 +270,109 @@ class FS(Util):
 
         return results
 
+    # -------------------------------------------------------------------------
+    # iter_ls - file listing, one file at a time
+    # -------------------------------------------------------------------------
+
+    def iter_ls(self, path='.'):
+        """
+        Iterates over the files of the directory **path**, yielding the
+        same information as :meth:`ls` gives for each of its 'files'.
+        Each entry is removed from the RPC reply as it is yielded, so a
+        directory of many thousands of files is not held twice, as XML and
+        as dicts.  If **path** is a file, only that file is yielded.
+
+        :param str path:
+            file-path on local device. defaults to current
+            working directory
+
+        :returns: iterator of file information (dict); empty when **path**
+                  is not found
+        """
+        xdir = self._file_list(path)
+        if xdir is None:
+            return
+        if not xdir.get('name'):
+            yield FS._decode_file(xdir.find('file-information'))
+            return
+        for fileinfo in FS._take(xdir):
+            yield FS._decode_file(fileinfo)
+
+    # -------------------------------------------------------------------------
+    # walk - directory tree
+    # -------------------------------------------------------------------------
+
+    def walk(self, path='.', workers=1):
+        """
+        Walks the directory tree rooted at **path**, top-down and level by
+        level, similar to the python ``os.walk``.  Symlinks are not
+        followed.  As with ``os.walk`` the caller can remove names from
+        *dirs* to skip those directories.
+
+        :param str path:
+            directory path on local device. defaults to current
+            working directory
+        :param int workers:
+            number of directories to list at once.  The listings of a
+            level are requested concurrently, over the one NETCONF session.
+
+        :returns: iterator of (dirpath, dirs, files), where *dirs* are
+                  the names of the sub-directories of *dirpath* and *files*
+                  the names of the other files
+        """
+        pool = None
+        if workers > 1:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(workers)
+        try:
+            pending = [path]
+            while pending:
+                listing = pool.imap if pool is not None else imap
+                subdirs = []
+                for found in listing(self._walk_dir, pending):
+                    if found is None:
+                        continue
+                    yield found
+                    dirpath, dirs, files = found
+                    subdirs.extend(dirpath.rstrip('/') + '/' + name
+                                   for name in dirs)
+                pending = subdirs
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    def _walk_dir(self, path):
+        xdir = self._file_list(path)
+        if xdir is None or not xdir.get('name'):
+            return None
+        dirs = []
+        files = []
+        for fileinfo in FS._take(xdir):
+            name = fileinfo.findtext('file-name').strip()
+            if fileinfo.find('file-directory') is not None:
+                dirs.append(name)
+            else:
+                files.append(name)
+        return (xdir.get('name'), dirs, files)
+
+    def _file_list(self, path):
+        """ the <directory> of a detailed file listing, or ``None`` """
+        rsp = self._dev.rpc.file_list(detail=True, path=path)
+        if rsp.find('output') is not None:
+            return None
+        return rsp.find('.//directory')
+
+    @classmethod
+    def _take(cls, xdir):
+        """ yields, and removes, each <file-information> of **xdir** """
+        while True:
+            fileinfo = xdir.find('file-information')
+            if fileinfo is None:
+                return
+            xdir.remove(fileinfo)
+            yield fileinfo
+
     # -------------------------------------------------------------------------
     # storage_usage - filesystem storage usage
     # -------------------------------------------------------------------------
@@ -431,3 +573,87 @@ class FS(Util):
         """
         results = self._ssh_exec("ln -sf %s %s" % (from_path, to_path))
         return True if results[0] is True else ''.join(results[1][2:-1])
+
+
+class RemoteFile(object):
+
+    """
+    A file on the device, read over SFTP, see :meth:`FS.open_read`.
+    """
+
+    def __init__(self, dev, path, offset=0, length=None,
+                 chunk_size=_READ_CHUNK):
+        self._dev = dev
+        self.path = path
+        self._offset = offset
+        self._length = length
+        self.chunk_size = chunk_size
+        self._scp = None
+        self._file = None
+        self.size = None
+        self.position = None
+        self._end = None
+
+    def open(self):
+        """
+        Opens the SFTP connection and the file.
+
+        :raises IOError: when the file can not be read
+        """
+        from jnpr.junos.utils.scp import SCP
+
+        self._scp = SCP(self._dev)
+        try:
+            self._file = self._scp.open_sftp().open(self.path, 'rb')
+            self.size = self._file.stat().st_size
+        except Exception:
+            self._scp.close()
+            raise
+        start = self._offset
+        if start < 0:
+            start = max(self.size + start, 0)
+        start = min(start, self.size)
+        self._end = self.size if self._length is None \
+            else min(self.size, start + self._length)
+        self._file.seek(start)
+        # request the whole range up front rather than one block per
+        # round trip
+        self._file.prefetch(self._end)
+        self.position = start
+        return self
+
+    def read(self, size=-1):
+        """
+        :returns: up to **size** bytes (str), all the remaining bytes by
+                  default; an empty str at the end of the range
+        """
+        left = self._end - self.position
+        if size < 0 or size > left:
+            size = left
+        data = self._file.read(size) if size else ''
+        self.position += len(data)
+        return data
+
+    def __iter__(self):
+        while True:
+            data = self.read(self.chunk_size)
+            if not data:
+                return
+            yield data
+
+    def close(self):
+        """ closes the file and the SFTP connection """
+        if self._scp is not None:
+            try:
+                if self._file is not None:
+                    self._file.close()
+            finally:
+                self._scp.close()
+                self._scp = None
+                self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_ty, exc_val, exc_tb):
+        self.close()
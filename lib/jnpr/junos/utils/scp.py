@@ -77,6 +77,21 @@ class SCP(object):
 
         :returns: SCPClient object
         """
+        self._connect()
+        return SCPClient(self._ssh.get_transport(), **scpargs)
+
+    def open_sftp(self):
+        """
+        Creates an SFTP client over the same kind of connection as
+        :meth:`open`, for random access to remote files, e.g. reading a
+        byte range.  Close it with :meth:`close`.
+
+        :returns: paramiko SFTPClient object
+        """
+        self._connect()
+        return self._ssh.open_sftp()
+
+    def _connect(self):
         #@@@ should check for multi-calls to connect to ensure we don't keep
         #@@@ opening new connections
         junos = self._junos
@@ -106,7 +121,6 @@ class SCP(object):
                           password=junos._auth_password,
                           sock=sock
                           )
-        return SCPClient(self._ssh.get_transport(), **scpargs)
 
     def close(self):
         """
@@ -0,0 +1,256 @@
+# stdlib
+import os
+import tempfile
+from copy import deepcopy
+
+# 3rd-party modules
+from lxml import etree
+
+"""
+Configuration snapshots kept by device and commit revision
+"""
+
+
+def commit_revision(dev):
+    """
+    Retrieve the revision of the committed configuration of a device,
+    using the commit history rather than the configuration itself.
+
+    :param Device dev: the Device object
+
+    :returns:
+        the commit time of the latest commit, in seconds since the epoch
+        (str), or ``None`` if there is no commit history
+
+    .. note:: The commit history identifies a commit only by its time, in
+              whole seconds.  Two commits made within the same second
+              share a revision, so a configuration stored after the first
+              of them is taken to be current after the second as well.
+    """
+    rsp = dev.rpc.get_commit_information()
+    latest = rsp.find('.//commit-history/date-time')
+    if latest is None:
+        return None
+    for name, value in latest.attrib.items():
+        if etree.QName(name).localname == 'seconds':
+            return value
+    return latest.text.strip()
+
+
+class ConfigSnapshot(object):
+
+    """
+    A configuration held locally so that many :class:`CfgTable` can be
+    retrieved from one RPC, rather than one RPC per table::
+
+        snap = ConfigSnapshot.fetch(dev)
+        zones = ZoneTable(dev, snapshot=snap).get()
+        ifs = ZoneIfsTable(dev, snapshot=snap).get(security_zone='trust')
+
+    Each table's xpath is evaluated here, and the matching nodes are
+    remembered by xpath so that tables sharing a path do not search the
+    configuration again.
+    """
+
+    def __init__(self, xml):
+        """
+        :param xml: <configuration> element, for example from
+                    :meth:`SnapshotStore.get`
+        """
+        self.xml = xml
+        self._nodes = {}
+        self._selected = {}
+
+    @classmethod
+    def fetch(cls, dev, options=None):
+        """
+        Retrieve the complete configuration of a device as a snapshot.
+
+        :param Device dev: the Device object
+
+        :param dict options:
+          *OPTIONAL* options to pass to get-configuration.  By default
+          {'inherit': 'inherit', 'groups': 'groups'} is sent, the same as
+          :class:`CfgTable`.
+        """
+        from jnpr.junos import jxml
+        if options is None:
+            options = jxml.INHERIT_GROUPS
+        return cls(dev.rpc.get_config(options=options))
+
+    def nodes(self, xpath):
+        """
+        :returns: list of the elements matching **xpath**
+        """
+        if xpath not in self._nodes:
+            self._nodes[xpath] = self.xml.xpath(xpath)
+        return self._nodes[xpath]
+
+    def select(self, xpath):
+        """
+        The equivalent of a get-configuration filtered to **xpath**: a new
+        <configuration> holding copies of the matching elements and,
+        around them, their ancestors with just their <name> keys.
+        The result is shared by callers asking for the same xpath.
+
+        :returns: <configuration> element
+        """
+        if xpath in self._selected:
+            return self._selected[xpath]
+
+        root = self.xml
+        top = etree.Element(root.tag)
+        made = {}
+
+        def _copy_of(anc):
+            if anc is None or anc is root:
+                return top
+            if anc not in made:
+                new = etree.SubElement(_copy_of(anc.getparent()), anc.tag)
+                name = anc.find('name')
+                if name is not None:
+                    new.append(deepcopy(name))
+                made[anc] = new
+            return made[anc]
+
+        for node in self.nodes(xpath):
+            _copy_of(node.getparent()).append(deepcopy(node))
+
+        self._selected[xpath] = top
+        return top
+
+
+class SnapshotStore(object):
+
+    """
+    Keeps the committed configuration of devices, by hostname and commit
+    revision, so that a configuration is only transferred again once the
+    device has committed a change.  Snapshots are held in memory and,
+    when a directory is given, saved there as
+    ``<path>/<hostname>/<revision>.xml.gz`` to be reused between runs.
+
+    * :meth:`get`: return the configuration of a device
+    * :meth:`find`: return a stored configuration, or ``None``
+    * :meth:`put`: store a configuration
+    * :meth:`revisions`: list the stored revisions of a device
+    """
+
+    def __init__(self, path=None, via_file=False, options=None):
+        """
+        :param str path:
+          *OPTIONAL* directory for the snapshot files, for example
+          :func:`jnpr.junos.utils.util.cache_dir('config')`.  When not
+          provided, snapshots are only held in memory.
+
+        :param bool via_file:
+          *OPTIONAL* when ``True`` configurations are fetched with
+          :meth:`Config.retrieve` (compressed file copy, requires shell
+          privileges) rather than get-configuration.
+
+        :param dict options:
+          *OPTIONAL* options to pass to get-configuration.  By default
+          {'inherit': 'inherit', 'groups': 'groups'} is sent, the same as
+          :class:`CfgTable`, so that a table bound to a snapshot returns
+          what a live :meth:`CfgTable.get` would.  Stores that share a
+          **path** must use the same options.
+        """
+        from jnpr.junos import jxml
+        self._path = path
+        self._via_file = via_file
+        self._options = jxml.INHERIT_GROUPS if options is None else options
+        self._mem = {}
+
+    def _fname(self, hostname, revision):
+        return os.path.join(self._path, hostname, '%s.xml.gz' % revision)
+
+    def find(self, hostname, revision):
+        """
+        :returns: the <configuration> element stored for **hostname** at
+                  **revision**, or ``None``
+        """
+        xml = self._mem.get((hostname, revision))
+        if xml is not None or self._path is None or revision is None:
+            return xml
+
+        fname = self._fname(hostname, revision)
+        if not os.path.isfile(fname):
+            return None
+        xml = etree.parse(fname).getroot()
+        self._mem[(hostname, revision)] = xml
+        return xml
+
+    def put(self, hostname, revision, xml):
+        """
+        Stores a <configuration> element for **hostname** at **revision**.
+        The file, if any, is written to a temporary name and then renamed
+        so that concurrent readers never see a partial snapshot.
+        """
+        self._mem[(hostname, revision)] = xml
+        if self._path is None or revision is None:
+            return
+
+        dirname = os.path.dirname(self._fname(hostname, revision))
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        fd, tmp = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        os.close(fd)
+        try:
+            etree.ElementTree(xml).write(tmp, compression=6)
+            os.rename(tmp, self._fname(hostname, revision))
+        except Exception:
+            os.remove(tmp)
+            raise
+
+    def revisions(self, hostname):
+        """
+        :returns: list of the revisions stored for **hostname**, oldest
+                  first
+        """
+        found = set(rev for host, rev in self._mem
+                    if host == hostname and rev is not None)
+        if self._path is not None:
+            dirname = os.path.join(self._path, hostname)
+            if os.path.isdir(dirname):
+                found.update(fname[:-len('.xml.gz')]
+                             for fname in os.listdir(dirname)
+                             if fname.endswith('.xml.gz'))
+        return sorted(found, key=lambda rev: (len(rev), rev))
+
+    def get(self, dev, revision=None):
+        """
+        Retrieve the committed configuration (XML) of a device.  The
+        current revision is checked with :func:`commit_revision` and the
+        configuration is only fetched when that revision is not stored.
+
+        :param Device dev: the Device object
+
+        :param str revision:
+          *OPTIONAL* a stored revision.  When not provided, the current
+          revision is used.
+
+        :returns: <configuration> element
+
+        :raises: ValueError: When a revision other than the current one
+                             is requested and it is not stored.
+        """
+        hostname = dev.hostname
+        if revision is not None:
+            xml = self.find(hostname, revision)
+            if xml is not None:
+                return xml
+
+        current = commit_revision(dev)
+        if revision is not None and revision != current:
+            raise ValueError("config revision %s of %s is not stored" %
+                             (revision, hostname))
+        xml = self.find(hostname, current)
+        if xml is None:
+            if self._via_file is True:
+                from jnpr.junos.utils.config import Config
+                xml = Config(dev).retrieve(
+                    inherit=self._options.get('inherit'))
+            else:
+                options = dict(self._options, database='committed')
+                xml = dev.rpc.get_configuration(options)
+            self.put(hostname, current, xml)
+        return xml
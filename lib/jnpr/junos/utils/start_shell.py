@@ -1,4 +1,3 @@
-import paramiko
 from select import select
 import re
 
@@ -68,8 +67,9 @@ class StartShell(object):
         drop into the Junos shell (csh).  This process opens a
         :class:`paramiko.SSHClient` instance.
         """
-        junos = self._nc
+        import paramiko
 
+        junos = self._nc
         client = paramiko.SSHClient()
         client.load_system_host_keys()
         client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
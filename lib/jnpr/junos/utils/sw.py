@@ -1,13 +1,19 @@
 # stdlib
 import hashlib
+import os
 import re
+import tempfile
 from os import path
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 # 3rd-party modules
 from lxml.builder import E
 
 # local modules
-from jnpr.junos.utils.util import Util
+from jnpr.junos.utils.util import Util, cache_dir
 from jnpr.junos.utils.scp import SCP
 from jnpr.junos.exception import SwRollbackError, RpcTimeoutError, RpcError
 
@@ -26,6 +32,54 @@ def _hashfile(afile, hasher, blocksize=65536):
     return hasher.hexdigest()
 
 
+def _checksum(package, algo, cache=True):
+    """
+    returns the :algo: ('md5', 'sha1' or 'sha256') hexdigest of the local
+    file :package:.  digests are kept in the local cache keyed by the file
+    path, size and modification time, so an unchanged file is only read
+    once for each algorithm.  the cache is best-effort; any problem with it
+    falls back to reading the file.
+    """
+    def _compute():
+        return _hashfile(open(package, 'rb'), hashlib.new(algo))
+
+    cdir = cache_dir('checksum') if cache is True else None
+    if cdir is None:
+        return _compute()
+    try:
+        st = os.stat(package)
+    except OSError:
+        return _compute()
+
+    key = (os.path.abspath(package), st.st_size, st.st_mtime)
+    cpath = os.path.join(cdir, hashlib.sha1(key[0]).hexdigest() + '.pkl')
+
+    digests = {}
+    try:
+        with open(cpath, 'rb') as f:
+            got_key, got = pickle.load(f)
+        if got_key == key:
+            digests = got
+    except Exception:
+        pass
+    if algo in digests:
+        return digests[algo]
+
+    digests[algo] = _compute()
+
+    try:
+        # write to a temp file first, so concurrent readers never see a
+        # partial cache file
+        fd, tmp = tempfile.mkstemp(dir=cdir)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, digests), f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp, cpath)
+    except Exception:
+        pass
+
+    return digests[algo]
+
+
 class SW(Util):
 
     """
@@ -65,43 +119,55 @@ class SW(Util):
     # -----------------------------------------------------------------------
 
     @classmethod
-    def local_sha256(cls, package):
+    def local_sha256(cls, package, cache=True):
         """
         Computes the SHA-256 value on the package file.
 
         :param str package:
           File-path to the package (\*.tgz) file on the local server
 
+        :param bool cache:
+          When ``True`` (default) the value is kept in the local cache and
+          reused until the file's size or modification time changes.
+
         :returns: SHA-256 checksum (str)
         :raises IOError: when **package** file does not exist
         """
-        return _hashfile(open(package, 'rb'), hashlib.sha256())
+        return _checksum(package, 'sha256', cache)
 
     @classmethod
-    def local_md5(cls, package):
+    def local_md5(cls, package, cache=True):
         """
         Computes the MD5 checksum value on the local package file.
 
         :param str package:
           File-path to the package (\*.tgz) file on the local server
 
+        :param bool cache:
+          When ``True`` (default) the value is kept in the local cache and
+          reused until the file's size or modification time changes.
+
         :returns: MD5 checksum (str)
         :raises IOError: when **package** file does not exist
         """
-        return _hashfile(open(package, 'rb'), hashlib.md5())
+        return _checksum(package, 'md5', cache)
 
     @classmethod
-    def local_sha1(cls, package):
+    def local_sha1(cls, package, cache=True):
         """
         Computes the SHA1 checksum value on the local package file.
 
         :param str package:
           File-path to the package (\*.tgz) file on the local server
 
+        :param bool cache:
+          When ``True`` (default) the value is kept in the local cache and
+          reused until the file's size or modification time changes.
+
         :returns: SHA1 checksum (str)
         :raises IOError: when **package** file does not exist
         """
-        return _hashfile(open(package, 'rb'), hashlib.sha1())
+        return _checksum(package, 'sha1', cache)
 
     @classmethod
     def progress(cls, dev, report):
@@ -260,11 +326,8 @@ class SW(Util):
             checksum = SW.local_md5(package)
 
         if cleanfs is True:
-            dto = self.dev.timeout
-            self.dev.timeout = 5 * 60
             _progress('cleaning filesystem ...')
-            self.rpc.request_system_storage_cleanup()
-            self.dev.timeout = dto
+            self.rpc.request_system_storage_cleanup(dev_timeout=5 * 60)
 
         # we want to give the caller an override so we don't always
         # need to copy the file, but the default is to do this, yo!
@@ -339,10 +402,9 @@ class SW(Util):
 
         :param str checksum:
           MD5 hexdigest of the package file. If this is not provided, then this
-          method will perform the calculation. If you are planning on using the
-          same image for multiple updates, you should consider using the
-          :meth:`local_md5` method to pre calculate this value and then provide to
-          this method.
+          method will perform the calculation with :meth:`local_md5`, which
+          keeps the value in the local cache, so installing the same image
+          on many devices reads the file only once.
 
         :param bool cleanfs:
           When ``True`` will perform a 'storeage cleanup' before SCP'ing the
@@ -0,0 +1,147 @@
+# stdlib
+import os
+import multiprocessing
+
+# 3rd-party modules
+import jinja2
+
+# local modules
+from jnpr.junos.utils.util import cache_dir
+
+"""
+Jinja2 template loading, used by :meth:`Device.Template` and
+:meth:`Config.load`
+"""
+
+# templates are found in the CWD and the jnpr.junos 'templates' directory
+_MODULEPATH = os.path.dirname(os.path.dirname(__file__))
+
+class _MyTemplateLoader(jinja2.BaseLoader):
+
+    """
+    Create a jinja2 template loader class that can be used to
+    load templates from all over the filesystem, but defaults
+    to the CWD and the 'templates' directory of the module
+    """
+
+    def __init__(self):
+        self.paths = ['.', os.path.join(_MODULEPATH, 'templates')]
+
+    def get_source(self, environment, template):
+
+        def _in_path(dir):
+            return os.path.exists(os.path.join(dir, template))
+
+        path = filter(_in_path, self.paths)
+        if not path:
+            raise jinja2.TemplateNotFound(template)
+
+        path = os.path.join(path[0], template)
+        mtime = os.path.getmtime(path)
+        with file(path) as f:
+            source = f.read().decode('utf-8')
+        return source, path, lambda: mtime == os.path.getmtime(path)
+
+
+class _BytecodeCache(jinja2.BytecodeCache):
+
+    """
+    Jinja2 bytecode cache kept under cache_dir('jinja2'), so templates are
+    not compiled again in later runs.  The directory is only looked up,
+    and made, when a template is first compiled.
+    """
+
+    def __init__(self):
+        self._cache = None
+        self._ready = False
+
+    def _fs_cache(self):
+        if self._ready is False:
+            path = cache_dir('jinja2')
+            if path is not None:
+                self._cache = jinja2.FileSystemBytecodeCache(path)
+            self._ready = True
+        return self._cache
+
+    def load_bytecode(self, bucket):
+        cache = self._fs_cache()
+        if cache is not None:
+            cache.load_bytecode(bucket)
+
+    def dump_bytecode(self, bucket):
+        cache = self._fs_cache()
+        if cache is not None:
+            cache.dump_bytecode(bucket)
+
+    def clear(self):
+        cache = self._fs_cache()
+        if cache is not None:
+            cache.clear()
+
+_Jinja2ldr = jinja2.Environment(loader=_MyTemplateLoader(),
+                                bytecode_cache=_BytecodeCache())
+
+
+def render_many(template, var_sets, env=None):
+    """
+    Renders one template against many sets of variables, e.g. one per
+    device, loading and compiling the template only once.
+
+    :param template:
+      template file-path (str) or a Jinja2 :class:`Template`
+
+    :param list var_sets:
+      iterable of dict, each rendered into the template in turn
+
+    :param env:
+      Jinja2 :class:`Environment` used to load a template given by
+      path; defaults to the environment used by :meth:`Device.Template`
+
+    :returns: list of rendered strings, in the order of **var_sets**
+    """
+    if isinstance(template, basestring):
+        template = (env or _Jinja2ldr).get_template(template)
+    return [template.render(tvars or {}) for tvars in var_sets]
+
+
+def _render_one(args):
+    # runs in a pool worker; each worker compiles the template once and
+    # then serves it from its own environment cache
+    template_path, tvars = args
+    return _Jinja2ldr.get_template(template_path).render(tvars or {})
+
+
+def render_pool(template_path, var_sets, processes=None, chunksize=1):
+    """
+    Renders one template against many sets of variables using a pool of
+    worker processes, so that large renders are spread across all CPUs.
+    Results are yielded as they complete, in the order of **var_sets**,
+    so each one can be handed to the matching device as soon as it is
+    ready::
+
+        for dev, text in zip(devs, render_pool(path, var_sets)):
+            Config(dev).load(template_path=path, rendered=text)
+
+    :param str template_path:
+      template file-path, found as by :meth:`Device.Template`
+
+    :param list var_sets:
+      iterable of dict, each rendered into the template in turn
+
+    :param int processes:
+      number of worker processes, defaults to the number of CPUs
+
+    :param int chunksize:
+      number of variable sets handed to a worker at a time
+
+    :returns: generator of rendered strings
+    """
+    pool = multiprocessing.Pool(processes)
+    try:
+        jobs = ((template_path, tvars) for tvars in var_sets)
+        for text in pool.imap(_render_one, jobs, chunksize):
+            yield text
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
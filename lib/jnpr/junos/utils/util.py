@@ -1,6 +1,38 @@
 """
 Junos PyEZ Utility Base Class
 """
+import os
+
+# environment variable used to relocate the local cache directory, an
+# empty value disables the local cache.
+CACHE_ENV = 'JUNOS_EZNC_CACHE'
+
+
+def cache_dir(*subdirs):
+    """
+    Returns the local directory used to keep data between runs (parsed
+    catalogs, compiled templates, checksums, ...), creating it if needed.
+    The location is ``$JUNOS_EZNC_CACHE`` when set, otherwise
+    ``~/.cache/junos-eznc``.
+
+    :param list subdirs: path components below the cache directory
+
+    :returns: directory path (str), or ``None`` when the cache is disabled
+              or cannot be created
+    """
+    top = os.environ.get(CACHE_ENV)
+    if top is None:
+        top = os.path.join(os.path.expanduser('~'), '.cache', 'junos-eznc')
+    if not top:
+        return None
+
+    path = os.path.join(top, *subdirs)
+    try:
+        if not os.path.isdir(path):
+            os.makedirs(path)
+    except OSError:
+        return None
+    return path if os.access(path, os.W_OK) else None
 
 
 class Util(object):
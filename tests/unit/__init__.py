@@ -0,0 +1,14 @@
+import os
+import shutil
+import tempfile
+
+# the caches the library writes while under test (parsed YAML of the op
+# tables, compiled templates, checksums) go to a temporary directory
+# rather than ~/.cache/junos-eznc; set before any test module imports
+# jnpr.junos.op
+_CACHE = tempfile.mkdtemp(prefix='junos-eznc-test-')
+os.environ['JUNOS_EZNC_CACHE'] = _CACHE
+
+
+def teardown():
+    shutil.rmtree(_CACHE, ignore_errors=True)
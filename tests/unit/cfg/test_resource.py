@@ -0,0 +1,152 @@
+import unittest
+from nose.plugins.attrib import attr
+
+from jnpr.junos.cfg.user import User
+from jnpr.junos.exception import RpcError, ConfigLoadError, \
+    RpcTimeoutError
+
+from mock import MagicMock, patch
+from lxml import etree
+
+_USERS = """<configuration><system><login>
+    <user><name>bob</name><uid>2001</uid><class>read-only</class></user>
+    <user><name>joe</name><uid>2002</uid><class>read-only</class></user>
+    </login></system></configuration>"""
+
+_LOAD_ERR = """<rpc-reply><rpc-error>
+    <error-severity>error</error-severity>
+    <error-path>[edit system login user bob]</error-path>
+    <error-message>invalid class</error-message>
+    </rpc-error></rpc-reply>"""
+
+
+@attr('unit')
+class TestResource(unittest.TestCase):
+
+    def setUp(self):
+        self.dev = MagicMock()
+        self.dev.rpc.get_config.side_effect = self._get_config
+        self.users = User(self.dev)
+
+    def _get_config(self, get, **kvargs):
+        got = etree.XML(_USERS)
+        name = get.findtext('.//user/name')
+        for user in got.xpath('.//user'):
+            if name is not None and user.findtext('name') != name:
+                user.getparent().remove(user)
+        return got
+
+    def _user(self, name, userclass='super-user'):
+        user = self.users[name]
+        user['userclass'] = userclass
+        return user
+
+    def test_resource_catalog(self):
+        self.users._rlist = ['bob', 'joe', 'ann']
+        catalog = self.users.catalog
+        self.assertEqual(self.dev.rpc.get_config.call_count, 1)
+        get = self.dev.rpc.get_config.call_args[0][0]
+        self.assertEqual(etree.tostring(get),
+                         '<system><login><user/></login></system>')
+        self.assertEqual(catalog['bob']['uid'], 2001)
+        self.assertEqual(catalog['joe']['userclass'], 'read-only')
+        self.assertFalse(catalog['ann']['_exists'])
+        self.assertEqual(catalog['bob'], self.users['bob'].has)
+        self.assertEqual(catalog['ann'], self.users['ann'].has)
+
+    def test_resource_catalog_when_new(self):
+        self.users._rlist = ['bob', 'ann']
+        with patch.object(User, '_r_when_new') as mock_new:
+            self.users.catalog_refresh()
+        self.assertEqual(mock_new.call_count, 1)
+        self.assertEqual(self.dev.rpc.get_config.call_count, 1)
+        self.assertEqual(self.users._rbulk, None)
+
+    def test_resource_catalog_read_hook(self):
+        self.users._rlist = ['bob']
+        with patch.object(User, '_xml_hook_read_begin') as mock_hook:
+            self.users.catalog_refresh()
+        get = self.dev.rpc.get_config.call_args[0][0]
+        mock_hook.assert_called_once_with(get)
+
+    def test_resource_catalog_each(self):
+        self.users._rlist = ['bob', 'joe']
+        with patch.object(User, '_xml_at_all', return_value=None):
+            catalog = self.users.catalog
+        self.assertEqual(self.dev.rpc.get_config.call_count, 2)
+        self.assertEqual(catalog['joe']['uid'], 2002)
+
+    def test_resource_write(self):
+        user = self._user('bob')
+        self.assertTrue(user.write())
+        self.assertEqual(user.should, {})
+        self.assertEqual(user['userclass'], 'super-user')
+        self.assertEqual(self.dev.rpc.load_config.call_count, 1)
+
+    def test_resource_write_load_error(self):
+        user = self._user('bob')
+        self.dev.rpc.load_config.side_effect = \
+            RpcError(rsp=etree.XML(_LOAD_ERR))
+        self.assertRaises(RpcError, user.write)
+        self.assertEqual(user.should['userclass'], 'super-user')
+        self.assertEqual(user.has['userclass'], 'read-only')
+
+    def test_resource_write_timeout(self):
+        user = self._user('bob')
+        self.dev.rpc.load_config.side_effect = \
+            RpcTimeoutError(self.dev, 'load-configuration', 30)
+        self.assertRaises(RpcTimeoutError, user.write)
+        self.assertEqual(user.should['userclass'], 'super-user')
+
+    def test_resource_batch(self):
+        with self.users.batch() as batch:
+            bob = self._user('bob')
+            joe = self._user('joe')
+            bob.write()
+            joe.write()
+            self.assertEqual(len(batch), 2)
+            self.assertFalse(self.dev.rpc.load_config.called)
+        self.assertEqual(self.dev.rpc.load_config.call_count, 1)
+        top = self.dev.rpc.load_config.call_args[0][0]
+        self.assertEqual(len(top.xpath('system/login/user')), 2)
+        self.assertEqual((bob.should, joe.should), ({}, {}))
+        self.assertEqual(joe['userclass'], 'super-user')
+
+    def test_resource_batch_load_error(self):
+        self.dev.rpc.load_config.side_effect = \
+            RpcError(rsp=etree.XML(_LOAD_ERR))
+        batch = self.users.batch()
+        with batch:
+            bob = self._user('bob', 'bogus')
+            joe = self._user('joe')
+            bob.write()
+            joe.write()
+            self.assertRaises(ConfigLoadError, batch.flush)
+        self.assertEqual(batch.errors[0]['resource'].name, 'bob')
+        self.assertEqual(bob.should['userclass'], 'bogus')
+        self.assertEqual(joe.should, {})
+
+    def test_resource_batch_timeout(self):
+        self.dev.rpc.load_config.side_effect = \
+            RpcTimeoutError(self.dev, 'load-configuration', 30)
+        batch = self.users.batch()
+        with batch:
+            bob = self._user('bob')
+            joe = self._user('joe')
+            bob.write()
+            joe.write()
+            self.assertRaises(RpcTimeoutError, batch.flush)
+        self.assertEqual(bob.should['userclass'], 'super-user')
+        self.assertEqual(joe.should['userclass'], 'super-user')
+        self.assertEqual(self.dev.rpc.load_config.call_count, 1)
+
+    def test_resource_batch_discard(self):
+        try:
+            with self.users.batch():
+                bob = self._user('bob')
+                bob.write()
+                raise ValueError()
+        except ValueError:
+            pass
+        self.assertFalse(self.dev.rpc.load_config.called)
+        self.assertEqual(bob.should['userclass'], 'super-user')
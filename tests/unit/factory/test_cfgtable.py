@@ -15,6 +15,7 @@ from mock import MagicMock, patch
 
 from jnpr.junos.factory import loadyaml
 from jnpr.junos.factory.factory_loader import FactoryLoader
+from jnpr.junos.utils.snapshot import ConfigSnapshot
 
 try:
     _YAML_ = loadyaml('lib/jnpr/junos/cfgro/srx')
@@ -140,6 +141,31 @@ class TestFactoryCfgTable(unittest.TestCase):
         self.zit._buildxml = MagicMock(return_value=etree.fromstring(ret_val))
         self.assertRaises(RuntimeError, self.zit.get, security_zone='abc')
 
+    @patch('jnpr.junos.Device.execute')
+    def test_cfgtable_snapshot(self, mock_execute):
+        snap = ConfigSnapshot(self._read_file('get-configuration.xml'))
+        zt = ZoneTable(self.dev, snapshot=snap).get()
+        self.assertEqual(zt.keys(), ['untrust'])
+        zit = ZoneIfsTable(self.dev, snapshot=snap)
+        zit.get(security_zone='untrust')
+        self.assertEqual(zit.keys(), ['ge-0/0/0.0'])
+        self.assertEqual(zit.xml.xpath('security/zones/security-zone/name')
+                         [0].text, 'untrust')
+        self.assertFalse(mock_execute.called)
+
+    def test_cfgtable_snapshot_named_item(self):
+        conf = self._read_file('get-configuration.xml')
+        zt = ZoneTable(self.dev, snapshot=conf).get('untrust')
+        self.assertEqual(zt.keys(), ['untrust'])
+        zt = ZoneTable(self.dev, snapshot=conf).get('trust')
+        self.assertEqual(zt.keys(), [])
+
+    def test_cfgtable_snapshot_select_cached(self):
+        snap = ConfigSnapshot(self._read_file('get-configuration.xml'))
+        xpath = '//configuration/security/zones/security-zone'
+        self.assertTrue(snap.select(xpath) is snap.select(xpath))
+        self.assertEqual(len(snap.nodes(xpath)), 1)
+
     def _read_file(self, fname):
         from ncclient.xml_ import NCElement
 
@@ -3,7 +3,10 @@ __credits__ = "Jeremy Schulman"
 
 import unittest
 from nose.plugins.attrib import attr
-from jnpr.junos.factory import FactoryLoader
+import os
+import shutil
+import tempfile
+from jnpr.junos.factory import FactoryLoader, loadyaml
 from mock import patch
 
 
@@ -85,3 +88,45 @@ class TestFactoryLoader(unittest.TestCase):
         self.assertRaises(
             ValueError, self.fl._add_dictfield, 'testing', 'age', {
                 'age/@seconds': 'test=test'}, {})
+
+
+@attr('unit')
+class TestLoadYaml(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.environ = patch.dict(os.environ,
+                                  {'JUNOS_EZNC_CACHE': self.tmpdir})
+        self.environ.start()
+        self.yml = os.path.join(os.path.dirname(__file__), '../../..',
+                                'lib/jnpr/junos/op/routes.yml')
+
+    def tearDown(self):
+        self.environ.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def test_loadyaml_cache(self):
+        catalog = loadyaml(self.yml)
+        self.assertEqual(len(os.listdir(os.path.join(self.tmpdir,
+                                                     'yaml'))), 1)
+        with patch('yaml.load') as mock_load:
+            cached = loadyaml(self.yml)
+            self.assertFalse(mock_load.called)
+        self.assertEqual(sorted(catalog.keys()), sorted(cached.keys()))
+        self.assertEqual(cached['RouteTable'].ITEM_XPATH,
+                         catalog['RouteTable'].ITEM_XPATH)
+
+    def test_loadyaml_cache_disabled(self):
+        with patch.dict(os.environ, {'JUNOS_EZNC_CACHE': ''}):
+            catalog = loadyaml(self.yml)
+        self.assertTrue('RouteTable' in catalog)
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_loadyaml_cache_stale(self):
+        loadyaml(self.yml)
+        with patch('jnpr.junos.factory._yaml_cache_key') as mock_key:
+            mock_key.return_value = ('changed',)
+            with patch('yaml.load') as mock_load:
+                mock_load.return_value = {}
+                self.assertEqual(loadyaml(self.yml), {})
+                self.assertTrue(mock_load.called)
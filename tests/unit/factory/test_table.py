@@ -4,6 +4,9 @@ __credits__ = "Jeremy Schulman"
 import unittest
 from nose.plugins.attrib import attr
 import os
+import gzip
+import shutil
+import tempfile
 
 from jnpr.junos import Device
 from jnpr.junos.factory.table import Table
@@ -132,6 +135,57 @@ class TestFactoryTable(unittest.TestCase):
         self.ppt.savexml('/vasr/tmssp/foo.xml', hostname=True, timestamp=True)
         self.assertEqual(mock_file.call_count, 2)
 
+    @patch('jnpr.junos.Device.execute')
+    def test_table_savexml_compress(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get('ge-0/0/0')
+        tmpdir = tempfile.mkdtemp()
+        try:
+            self.ppt.savexml(os.path.join(tmpdir, 'foo.xml'), compress=True)
+            path = os.path.join(tmpdir, 'foo.xml.gz')
+            self.assertTrue('ge-0/0/1' in gzip.open(path).read())
+            tbl = PhyPortTable(path=path).get()
+            self.assertEqual(tbl.keys(), ['ge-0/0/0', 'ge-0/0/1'])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    @patch('jnpr.junos.Device.execute')
+    def test_table_snapshot(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get('ge-0/0/0')
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = self.ppt.save_snapshot(os.path.join(tmpdir, 'ppt.snap'),
+                                          hostname=True)
+            self.assertEqual(path, os.path.join(tmpdir, 'ppt_1.1.1.1.snap'))
+            items = PhyPortTable(self.dev).load_snapshot(path)
+            self.assertEqual(items, self.ppt.items())
+        finally:
+            shutil.rmtree(tmpdir)
+
+    @patch('jnpr.junos.Device.execute')
+    def test_table_snapshot_raw_xml(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get('ge-0/0/0')
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = self.ppt.save_snapshot(os.path.join(tmpdir, 'ppt.snap'),
+                                          raw_xml=True)
+            tbl = PhyPortTable(self.dev)
+            tbl.load_snapshot(path)
+            self.assertEqual(tbl['ge-0/0/1'].mtu, self.ppt['ge-0/0/1'].mtu)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_table_load_snapshot_ValueError(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'foo.xml')
+            open(path, 'w').write('<root/>')
+            self.assertRaises(ValueError, self.table.load_snapshot, path)
+        finally:
+            shutil.rmtree(tmpdir)
+
     def _read_file(self, fname):
         from ncclient.xml_ import NCElement
 
@@ -3,8 +3,10 @@ __author__ = "Rick Sherman"
 import unittest2 as unittest
 from nose.plugins.attrib import attr
 from mock import patch
+from lxml import etree
 import os
 import json
+from StringIO import StringIO
 
 from jnpr.junos import Device
 from jnpr.junos.factory.to_json import PyEzJSONEncoder, TableJSONEncoder, TableViewJSONEncoder
@@ -66,6 +68,33 @@ class TestToJson(unittest.TestCase):
             '"host-name": "firefly", "product-model": "firefly-perimeter", "product-name": "firefly-perimeter"}'
         self.assertEqual(json.dumps(resp), j)
 
+    @patch('jnpr.junos.Device.execute')
+    def test_table_dump_json(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        rst = RouteSummaryTable(self.dev)
+        rst.get()
+        fp = StringIO()
+        self.assertEqual(rst.dump_json(fp, ndjson=False), 3)
+        self.assertEqual(json.loads(fp.getvalue()), json.loads(rst.to_json()))
+
+    @patch('jnpr.junos.Device.execute')
+    def test_table_dump_ndjson(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        rst = RouteSummaryTable(self.dev)
+        rst.get()
+        fp = StringIO()
+        self.assertEqual(rst.dump_json(fp), 3)
+        lines = fp.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0]),
+                         json.loads(rst[0].to_json()))
+
+    def test_table_dump_json_no_view(self):
+        rst = RouteSummaryTable(self.dev)
+        rst.xml = etree.XML('<root/>')
+        rst.view = None
+        self.assertRaises(RuntimeError, rst.dump_json, StringIO())
+
     def _read_file(self, fname):
         from ncclient.xml_ import NCElement
 
@@ -35,7 +35,7 @@ facts = {'domain': None, 'hostname': 'firefly', 'ifd_style': 'CLASSIC',
 @attr('unit')
 class Test_MyTemplateLoader(unittest.TestCase):
     def setUp(self):
-        from jnpr.junos.device import _MyTemplateLoader
+        from jnpr.junos.utils.template import _MyTemplateLoader
         self.template_loader = _MyTemplateLoader()
 
     @patch('__builtin__.filter')
@@ -47,7 +47,7 @@ class Test_MyTemplateLoader(unittest.TestCase):
             import jinja2
             self.assertEqual(type(ex), jinja2.exceptions.TemplateNotFound)
 
-    @patch('jnpr.junos.device.os.path')
+    @patch('jnpr.junos.utils.template.os.path')
     def test_temp_load_get_source_filter_true(self, os_path_mock):
         # cant use @patch here as with statement will have exit
         m = mock_open()
@@ -70,17 +70,17 @@ class TestDevice(unittest.TestCase):
     def tearDown(self, mock_session):
         self.dev.close()
 
-    @patch('jnpr.junos.device.netconf_ssh')
+    @patch('ncclient.manager')
     def test_device_ConnectAuthError(self, mock_manager):
         mock_manager.connect.side_effect = NcErrors.AuthenticationError
         self.assertRaises(EzErrors.ConnectAuthError, self.dev.open)
 
-    @patch('jnpr.junos.device.netconf_ssh')
+    @patch('ncclient.manager')
     def test_device_ConnectRefusedError(self, mock_manager):
         mock_manager.connect.side_effect = NcErrors.SSHError
         self.assertRaises(EzErrors.ConnectRefusedError, self.dev.open)
 
-    @patch('jnpr.junos.device.netconf_ssh')
+    @patch('ncclient.manager')
     @patch('jnpr.junos.device.datetime')
     def test_device_ConnectTimeoutError(self, mock_datetime, mock_manager):
         mock_manager.connect.side_effect = NcErrors.SSHError("Could not open socket to 1.1.1.1:830")
@@ -90,7 +90,7 @@ class TestDevice(unittest.TestCase):
                                                   currenttime + timedelta(minutes=4)]
         self.assertRaises(EzErrors.ConnectTimeoutError, self.dev.open)
 
-    @patch('jnpr.junos.device.netconf_ssh')
+    @patch('ncclient.manager')
     @patch('jnpr.junos.device.datetime')
     def test_device_diff_err_message(self, mock_datetime, mock_manager):
         NcErrors.SSHError.message = 'why are you trying :)'
@@ -101,13 +101,13 @@ class TestDevice(unittest.TestCase):
                                                   currenttime + timedelta(minutes=4)]
         self.assertRaises(EzErrors.ConnectError, self.dev.open)
 
-    @patch('jnpr.junos.device.netconf_ssh')
+    @patch('ncclient.manager')
     def test_device_ConnectUnknownHostError(self, mock_manager):
         import socket
         mock_manager.connect.side_effect = socket.gaierror
         self.assertRaises(EzErrors.ConnectUnknownHostError, self.dev.open)
 
-    @patch('jnpr.junos.device.netconf_ssh')
+    @patch('ncclient.manager')
     def test_device_other_error(self, mock_manager):
         mock_manager.connect.side_effect = TypeError
         self.assertRaises(EzErrors.ConnectError, self.dev.open)
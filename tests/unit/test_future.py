@@ -0,0 +1,155 @@
+import unittest
+from nose.plugins.attrib import attr
+from threading import Event
+
+from jnpr.junos import Device
+from jnpr.junos import jxml as JXML
+from jnpr.junos.future import RpcFuture, gather
+from jnpr.junos.exception import RpcError, RpcTimeoutError, \
+    ConnectClosedError
+
+from ncclient.devices.junos import JunosDeviceHandler
+from ncclient.operations import RaiseMode
+from ncclient.operations.rpc import RPCReply
+from ncclient.transport.errors import TransportError
+from mock import MagicMock, patch
+from lxml import etree
+
+_OK = """<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"
+    message-id="urn:uuid:1"><software-information>
+    <host-name>r1</host-name></software-information></rpc-reply>"""
+
+_ERR = """<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"
+    message-id="urn:uuid:1"><rpc-error><error-type>protocol</error-type>
+    <error-severity>error</error-severity>
+    <error-message>syntax error</error-message></rpc-error></rpc-reply>"""
+
+
+@attr('unit')
+class TestRpcFuture(unittest.TestCase):
+
+    def setUp(self):
+        self.dev = Device(host='1.1.1.1')
+        self.dev.connected = True
+        self.dev._conn = MagicMock()
+        self.dev._conn._device_handler = JunosDeviceHandler(
+            {'name': 'junos'})
+        self.dev._conn.raise_mode = RaiseMode.ALL
+        self.dev._conn.timeout = 30
+        self.dev._nc_transform = self.dev.transform
+        self.dev._norm_transform = lambda: JXML.normalize_xslt
+        self.op = MagicMock()
+        self.op.event = Event()
+        self.op.error = None
+        self.op.raise_mode = RaiseMode.ALL
+
+    def _future(self, timeout=None, normalize=None):
+        with patch('ncclient.operations.third_party.juniper.rpc.ExecuteRpc',
+                   return_value=self.op) as mock_rpc:
+            future = RpcFuture(self.dev,
+                               etree.XML('<get-software-information/>'),
+                               timeout, normalize)
+        self.assertTrue(mock_rpc.call_args[1]['async'])
+        return future
+
+    def _reply(self, raw):
+        self.op.reply = RPCReply(raw)
+        self.op.event.set()
+
+    def test_future_sends_request(self):
+        self._future()
+        self.assertEqual(self.op.request.call_args[0][0].tag,
+                         'get-software-information')
+
+    def test_future_result(self):
+        future = self._future()
+        self.assertFalse(future.done())
+        self._reply(_OK)
+        self.assertTrue(future.done())
+        self.assertEqual(future.result().findtext('host-name'), 'r1')
+        self.assertEqual(future.exception(), None)
+
+    def test_future_result_normalize(self):
+        future = self._future(normalize=True)
+        self._reply(_OK.replace('>r1<', '>\n r1 \n<'))
+        self.assertEqual(future.result().findtext('host-name'), 'r1')
+        future = self._future(normalize=False)
+        self._reply(_OK.replace('>r1<', '>\n r1 \n<'))
+        self.assertEqual(future.result().findtext('host-name'), '\n r1 \n')
+
+    def test_future_result_rpc_error(self):
+        future = self._future()
+        self._reply(_ERR)
+        self.assertRaises(RpcError, future.result)
+        self.assertTrue(isinstance(future.exception(), RpcError))
+
+    def test_future_result_transport_error(self):
+        future = self._future()
+        self.op.error = TransportError()
+        self.op.event.set()
+        self.assertRaises(ConnectClosedError, future.result)
+
+    def test_future_result_timeout(self):
+        future = self._future(timeout=0.01)
+        self.assertRaises(RpcTimeoutError, future.result)
+        self.assertTrue(future.done())
+
+    def test_future_result_wait_timeout(self):
+        future = self._future()
+        self.assertRaises(RpcTimeoutError, future.result, 0)
+        self.assertFalse(future.done())
+        self.assertEqual(self.dev.timeout, 30)
+
+    def test_future_cancel(self):
+        future = self._future()
+        self.assertTrue(future.cancel())
+        self.assertTrue(future.cancelled())
+        self.assertTrue(future.done())
+        self.assertRaises(RuntimeError, future.result)
+
+    def test_future_cancel_done(self):
+        future = self._future()
+        self._reply(_OK)
+        self.assertFalse(future.cancel())
+
+    def test_future_gather(self):
+        done = self._future()
+        self._reply(_OK)
+        failed = MagicMock()
+        failed.result.side_effect = RpcError()
+        results = gather([done, failed])
+        self.assertEqual(results[0].tag, 'software-information')
+        self.assertTrue(isinstance(results[1], RpcError))
+
+    def test_device_execute_async(self):
+        with patch('jnpr.junos.future.RpcFuture.__init__',
+                   return_value=None) as mock_init:
+            self.dev.execute_async('<get-software-information/>', timeout=5)
+        args = mock_init.call_args[0]
+        self.assertEqual((args[0], args[1].tag, args[2]),
+                         (self.dev, 'get-software-information', 5))
+
+    def test_device_execute_async_closed(self):
+        self.dev.connected = False
+        self.assertRaises(ConnectClosedError, self.dev.execute_async,
+                          '<get-software-information/>')
+
+    @patch('ncclient.operations.third_party.juniper.rpc.ExecuteRpc')
+    def test_device_execute_per_call_options(self, mock_rpc):
+        mock_rpc.return_value = self.op
+        self.op.request.side_effect = \
+            lambda rpc: self._reply(_OK.replace('>r1<', '> r1 <'))
+        rsp = self.dev.execute('<get-software-information/>',
+                               dev_timeout=300, normalize=True)
+        self.assertEqual(rsp.findtext('host-name'), 'r1')
+        self.assertEqual(mock_rpc.call_args[1]['timeout'], 300)
+        self.assertFalse(self.dev._conn.rpc.called)
+        self.assertEqual(self.dev._conn.timeout, 30)
+        self.assertEqual(self.dev.transform, self.dev._nc_transform)
+
+    @patch('ncclient.operations.third_party.juniper.rpc.ExecuteRpc')
+    def test_device_execute_per_call_timeout(self, mock_rpc):
+        mock_rpc.return_value = self.op
+        self.assertRaises(RpcTimeoutError, self.dev.execute,
+                          '<get-software-information/>', dev_timeout=0.01)
+        self.assertEqual(self.dev._conn.timeout, 30)
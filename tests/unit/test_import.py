@@ -0,0 +1,41 @@
+import os
+import sys
+import subprocess
+import unittest
+from nose.plugins.attrib import attr
+
+_LIBDIR = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                       '..', '..', 'lib'))
+
+_PROBE = """
+import sys, time
+t0 = time.time()
+import jnpr.junos
+print time.time() - t0
+print ' '.join(m for m in ('ncclient', 'paramiko', 'jinja2',
+                          'multiprocessing')
+               if m in sys.modules)
+"""
+
+
+def _probe():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [_LIBDIR, env.get('PYTHONPATH')]))
+    proc = subprocess.Popen([sys.executable, '-c', _PROBE], env=env,
+                            stdout=subprocess.PIPE)
+    out = proc.communicate()[0].split('\n')
+    return float(out[0]), out[1].split()
+
+
+@attr('unit')
+class TestImport(unittest.TestCase):
+
+    def test_import_defers_transport_modules(self):
+        elapsed, loaded = _probe()
+        self.assertEqual(loaded, [])
+
+if __name__ == '__main__':
+    runs = [_probe()[0] for _ in range(5)]
+    print "import jnpr.junos: best %.3fs, worst %.3fs" % (min(runs),
+                                                         max(runs))
@@ -3,7 +3,9 @@ __credits__ = "Jeremy Schulman"
 
 import unittest
 from nose.plugins.attrib import attr
-from jnpr.junos.jxml import NAME, INSERT, remove_namespaces
+from jnpr.junos.jxml import NAME, INSERT, remove_namespaces, to_dict, \
+    rpc_to_dict, conf_diff, conf_diff_text, conf_delta
+from lxml import etree
 
 
 @attr('unit')
@@ -33,3 +35,125 @@ class Test_JXML(unittest.TestCase):
             if i > 0:
                 i = i + 1
         self.assertTrue(i <= 0)
+
+    def test_to_dict(self):
+        xml = etree.XML("""<a><!-- comment --><b>1</b><b>2</b>
+                           <c><d>x</d></c><e/><f>  </f></a>""")
+        self.assertEqual(to_dict(xml), {'b': ['1', '2'], 'c': {'d': 'x'},
+                                        'e': None, 'f': None})
+
+    def test_to_dict_attrs(self):
+        xml = etree.XML('<a format="x"><b style="y">1</b><c/></a>')
+        self.assertEqual(to_dict(xml, attrs=True),
+                         {'@format': 'x', 'b': {'@style': 'y', '#text': '1'},
+                          'c': None})
+        self.assertEqual(rpc_to_dict(None, xml, attrs=True),
+                         to_dict(xml, attrs=True))
+
+    def test_conf_diff(self):
+        old = etree.XML("""<configuration><system>
+            <host-name>a</host-name>
+            <login><user><name>rick</name><uid>2000</uid></user></login>
+            </system></configuration>""")
+        new = etree.XML("""<configuration><system>
+            <login><user><name>rick</name><uid>2000</uid></user>
+            <user><name>bob</name><class>super-user</class></user></login>
+            <host-name>b</host-name>
+            </system></configuration>""")
+        changes = conf_diff(old, new)
+        self.assertEqual([(op, path, ele.tag) for op, path, ele in changes],
+                         [('-', ['system'], 'host-name'),
+                          ('+', ['system'], 'host-name'),
+                          ('+', ['system', 'login'], 'user')])
+        self.assertEqual(conf_diff_text(changes),
+                         '\n[edit system]\n-  host-name a;\n'
+                         '+  host-name b;\n[edit system login]\n'
+                         '+  user bob {\n+      class super-user;\n+  }\n')
+
+    def test_conf_diff_same(self):
+        xml = etree.XML('<configuration><system><ssh/></system>'
+                        '</configuration>')
+        self.assertEqual(conf_diff_text(conf_diff(xml, xml)), None)
+
+    def test_conf_diff_keyless_lists(self):
+        xml = """<configuration><security><policies>
+            <policy><from-zone-name>trust</from-zone-name>
+            <to-zone-name>untrust</to-zone-name>
+            <policy><name>p1</name></policy></policy>
+            <policy><from-zone-name>trust</from-zone-name>
+            <to-zone-name>dmz</to-zone-name>
+            <policy><name>p9</name></policy></policy>
+            </policies></security><policy-options><policy-statement>
+            <name>ps</name><term><name>t</name><from><route-filter>
+            <address>10.0.0.0/8</address><exact/></route-filter>
+            <route-filter><address>172.16.0.0/12</address><orlonger/>
+            </route-filter></from></term></policy-statement>
+            </policy-options></configuration>"""
+        self.assertEqual(conf_diff(etree.XML(xml), etree.XML(xml)), [])
+        new = etree.XML(xml.replace('p9', 'p8'))
+        changes = conf_diff(etree.XML(xml), new)
+        self.assertEqual([(op, path, ele.findtext('name'))
+                          for op, path, ele in changes],
+                         [('-', ['security', 'policies', 'policy '
+                                 'from-zone-name trust to-zone-name dmz'],
+                           'p9'),
+                          ('+', ['security', 'policies', 'policy '
+                                 'from-zone-name trust to-zone-name dmz'],
+                           'p8')])
+
+    def test_conf_delta(self):
+        old = etree.XML("""<configuration><system>
+            <host-name>a</host-name><domain-name>x</domain-name>
+            <services><ssh/><telnet/></services>
+            <name-server>1.1.1.1</name-server>
+            <name-server>1.0.0.1</name-server>
+            <login><user><name>old</name><uid>3</uid></user></login>
+            </system></configuration>""")
+        new = etree.XML("""<configuration><system>
+            <host-name>b</host-name><services><ssh/></services>
+            <name-server>1.1.1.1</name-server>
+            <login><user><name>new</name><uid>4</uid></user></login>
+            </system></configuration>""")
+        self.assertEqual(
+            etree.tostring(conf_delta(old, new)),
+            '<configuration><system>'
+            '<domain-name operation="delete"/>'
+            '<name-server operation="delete">1.0.0.1</name-server>'
+            '<host-name>b</host-name>'
+            '<services><telnet operation="delete"/></services>'
+            '<login><user operation="delete"><name>old</name></user>'
+            '<user><name>new</name><uid>4</uid></user></login>'
+            '</system></configuration>')
+        self.assertEqual(conf_delta(old, old), None)
+
+    def test_conf_delta_keyless_lists(self):
+        xml = """<configuration><security><policies>
+            <policy><from-zone-name>trust</from-zone-name>
+            <to-zone-name>untrust</to-zone-name>
+            <policy><name>p1</name></policy></policy>
+            <policy><from-zone-name>trust</from-zone-name>
+            <to-zone-name>dmz</to-zone-name>
+            <policy><name>p9</name></policy></policy>
+            </policies></security><policy-options><policy-statement>
+            <name>ps</name><term><name>t</name><from><route-filter>
+            <address>10.0.0.0/8</address><exact/></route-filter>
+            <route-filter><address>172.16.0.0/12</address><orlonger/>
+            </route-filter></from></term></policy-statement>
+            </policy-options></configuration>"""
+        parser = etree.XMLParser(remove_blank_text=True)
+        old = etree.XML(xml, parser)
+        self.assertEqual(conf_delta(old, etree.XML(xml, parser)), None)
+        new = etree.XML(xml.replace('p9', 'p8').replace('<exact/>', ''),
+                        parser)
+        self.assertEqual(
+            etree.tostring(conf_delta(old, new)),
+            '<configuration><security><policies><policy replace="replace">'
+            '<from-zone-name>trust</from-zone-name>'
+            '<to-zone-name>dmz</to-zone-name>'
+            '<policy><name>p8</name></policy></policy></policies>'
+            '</security><policy-options><policy-statement><name>ps</name>'
+            '<term><name>t</name><from><route-filter operation="delete">'
+            '<address>10.0.0.0/8</address><exact/></route-filter>'
+            '<route-filter><address>10.0.0.0/8</address></route-filter>'
+            '</from></term></policy-statement></policy-options>'
+            '</configuration>')
@@ -56,6 +56,13 @@ class Test_RpcMetaExec(unittest.TestCase):
         self.assertEqual(mock_execute_fn.call_args[0][0].get('format'),
                          'text')
 
+    @patch('jnpr.junos.device.Device.execute')
+    def test_rpcmeta_load_config_dev_timeout(self, mock_execute_fn):
+        self.rpc.load_config('system {}', format='text', dev_timeout=60)
+        self.assertEqual(mock_execute_fn.call_args[1], {'dev_timeout': 60})
+        self.assertEqual(mock_execute_fn.call_args[0][0].get('dev_timeout'),
+                         None)
+
     @patch('jnpr.junos.device.Device.execute')
     def test_rpcmeta_exec_rpc_vargs(self, mock_execute_fn):
         self.rpc.system_users_information(dict(format='text'))
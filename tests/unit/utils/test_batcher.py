@@ -0,0 +1,92 @@
+import unittest
+from nose.plugins.attrib import attr
+from time import sleep
+
+from jnpr.junos import Device
+from jnpr.junos.utils.batcher import CommitBatcher
+from jnpr.junos.exception import ConfigLoadError, CommitError
+
+from mock import MagicMock, call
+from lxml import etree
+
+
+@attr('unit')
+class TestCommitBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.dev = Device(host='1.1.1.1')
+        self.batcher = CommitBatcher(self.dev, window=60, max_changes=10,
+                                     comment='batch')
+        self.cu = self.batcher._cu
+        self.cu.load = MagicMock()
+        self.cu.commit = MagicMock()
+        self.cu.rollback = MagicMock()
+        self.err_rsp = etree.XML(
+            '<rpc-error><error-severity>error</error-severity>'
+            '<error-message>failed</error-message></rpc-error>')
+
+    def tearDown(self):
+        self.batcher.close()
+
+    def test_flush_one_commit(self):
+        changes = [self.batcher.load('set a %d' % i, format='set')
+                   for i in range(3)]
+        self.assertFalse(changes[0].done())
+        self.batcher.flush()
+        self.assertEqual([c.wait(0) for c in changes], [True] * 3)
+        self.cu.commit.assert_called_once_with(comment='batch')
+        self.assertEqual(self.batcher.commits, 1)
+
+    def test_load_error_fails_alone(self):
+        ex = ConfigLoadError(rsp=self.err_rsp)
+        self.cu.load.side_effect = [None, ex, None, None]
+        changes = [self.batcher.load('set a %d' % i, format='set')
+                   for i in range(3)]
+        self.batcher.flush()
+        self.assertRaises(ConfigLoadError, changes[1].wait, 0)
+        self.assertTrue(changes[0].wait(0))
+        self.assertTrue(changes[2].wait(0))
+        # the good change is loaded again after the rollback
+        self.assertEqual(self.cu.load.call_args_list[2],
+                         call('set a 0', format='set'))
+        self.assertEqual(self.cu.commit.call_count, 1)
+
+    def test_commit_error_retried_per_change(self):
+        ex = CommitError(rsp=self.err_rsp)
+        self.cu.commit.side_effect = [ex, None, ex]
+        changes = [self.batcher.load('set a %d' % i, format='set')
+                   for i in range(2)]
+        self.batcher.flush()
+        self.assertTrue(changes[0].wait(0))
+        self.assertRaises(CommitError, changes[1].wait, 0)
+        self.assertEqual(self.batcher.commits, 1)
+
+    def test_window(self):
+        self.batcher.window = 0.01
+        change = self.batcher.load('set a', format='set')
+        self.assertTrue(change.wait(5))
+
+    def test_flush_during_window(self):
+        self.batcher.window = 0.1
+        change = self.batcher.load('set a', format='set')
+        sleep(0.02)                 # the thread is waiting out the window
+        self.batcher.flush()
+        self.assertTrue(change.wait(0))
+        sleep(0.2)                  # ... which has now ended
+        self.assertTrue(self.batcher._thread.isAlive())
+        change = self.batcher.load('set b', format='set')
+        self.assertTrue(change.wait(5))
+        self.assertEqual(self.cu.commit.call_count, 2)
+
+    def test_max_changes(self):
+        self.batcher.max_changes = 2
+        changes = [self.batcher.load('set a %d' % i, format='set')
+                   for i in range(2)]
+        self.assertTrue(changes[1].wait(5))
+        self.assertEqual(self.cu.commit.call_count, 1)
+
+    def test_closed(self):
+        change = self.batcher.load('set a', format='set')
+        self.batcher.close()
+        self.assertTrue(change.done())
+        self.assertRaises(RuntimeError, self.batcher.load, 'set b')
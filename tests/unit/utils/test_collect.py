@@ -0,0 +1,108 @@
+import unittest
+from nose.plugins.attrib import attr
+import os
+import shutil
+import tempfile
+
+from jnpr.junos import Device
+from jnpr.junos.utils.collect import FleetCollect, _throttle
+
+from mock import MagicMock, patch
+
+
+@attr('unit')
+class TestFleetCollect(unittest.TestCase):
+
+    def setUp(self):
+        self.devs = [Device(host='10.0.0.%d' % i) for i in range(1, 3)]
+        self.collect = FleetCollect(self.devs, workers=2)
+        self.local_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.local_dir)
+
+    def _scp_get(self, remote, local):
+        open(local, 'w').write(remote)
+
+    @patch('jnpr.junos.utils.collect.SW.local_md5', return_value='abc')
+    @patch('jnpr.junos.utils.collect.SCP')
+    @patch('jnpr.junos.utils.collect.FS')
+    def test_collect_get(self, mock_fs, mock_scp, mock_md5):
+        # both workers share this mock, so its methods are made up front
+        # rather than by whichever thread gets there first
+        fs = mock_fs.return_value
+        fs.tgz.return_value = True
+        fs.rm.return_value = True
+        fs.checksum.return_value = 'abc'
+        scp = mock_scp.return_value.__enter__.return_value
+        scp.get.side_effect = self._scp_get
+        progress = MagicMock()
+        got = self.collect.get(['/var/log/*', '/var/crash/*core*'],
+                               self.local_dir, progress=progress)
+        self.assertEqual(sorted(got), ['10.0.0.1', '10.0.0.2'])
+        self.assertEqual(got['10.0.0.1'], [
+            os.path.join(self.local_dir, '10.0.0.1', 'var-log.tgz'),
+            os.path.join(self.local_dir, '10.0.0.1', 'var-crash-core.tgz')])
+        self.assertTrue(os.path.isfile(got['10.0.0.2'][1]))
+        fs.tgz.assert_any_call('/var/log/*',
+                               '/var/tmp/pyez-collect-var-log.tgz')
+        fs.rm.assert_any_call('/var/tmp/pyez-collect-var-crash-core.tgz')
+        self.assertEqual(len(fs.rm.call_args_list), 4)
+        self.assertEqual(self.collect.errors, {})
+        self.assertTrue(progress.called)
+
+    @patch('jnpr.junos.utils.collect.SW.local_md5', return_value='abc')
+    @patch('jnpr.junos.utils.collect.SCP')
+    @patch('jnpr.junos.utils.collect.FS')
+    def test_collect_get_checksum_mismatch(self, mock_fs, mock_scp,
+                                           mock_md5):
+        fs = mock_fs.return_value
+        fs.tgz.return_value = True
+        fs.checksum.side_effect = ['abc', 'xyz']
+        scp = mock_scp.return_value.__enter__.return_value
+        scp.get.side_effect = self._scp_get
+        self.collect.devs = self.devs[:1]
+        self.collect.workers = 1
+        got = self.collect.get('/var/log/*', self.local_dir)
+        self.assertEqual(got, {'10.0.0.1': [os.path.join(
+            self.local_dir, '10.0.0.1', 'var-log.tgz')]})
+        got = self.collect.get('/var/log/*', self.local_dir)
+        self.assertEqual(got, {})
+        self.assertTrue(isinstance(self.collect.errors['10.0.0.1'],
+                                   RuntimeError))
+        self.assertFalse(os.path.exists(os.path.join(
+            self.local_dir, '10.0.0.1', 'var-log.tgz')))
+        self.assertEqual(fs.rm.call_count, 2)
+
+    @patch('jnpr.junos.utils.collect.SCP')
+    @patch('jnpr.junos.utils.collect.FS')
+    def test_collect_get_archive_error(self, mock_fs, mock_scp):
+        mock_fs.return_value.tgz.return_value = 'No such file or directory'
+        got = self.collect.get(['/var/log/*'], self.local_dir)
+        self.assertEqual(got, {})
+        self.assertEqual(sorted(self.collect.errors), ['10.0.0.1',
+                                                       '10.0.0.2'])
+        self.assertFalse(mock_scp.called)
+
+    @patch('jnpr.junos.utils.collect.SW.local_md5', return_value='abc')
+    @patch('jnpr.junos.utils.collect.SCP')
+    @patch('jnpr.junos.utils.collect.FS')
+    def test_collect_get_rate(self, mock_fs, mock_scp, mock_md5):
+        mock_fs.return_value.tgz.return_value = True
+        mock_fs.return_value.checksum.return_value = 'abc'
+        self.collect.rate = 1000
+        self.collect.get(['/var/log/*'], self.local_dir)
+        self.assertTrue(callable(mock_scp.call_args[1]['progress']))
+
+    @patch('jnpr.junos.utils.collect.sleep')
+    @patch('jnpr.junos.utils.collect.time')
+    def test_collect_throttle(self, mock_time, mock_sleep):
+        mock_time.return_value = 100.0
+        progress = _throttle(1000)
+        progress('f', 4000, 0)
+        mock_time.return_value = 101.0
+        progress('f', 4000, 3000)
+        mock_sleep.assert_called_once_with(2.0)
+        mock_time.return_value = 105.0
+        progress('f', 4000, 4000)
+        self.assertEqual(mock_sleep.call_count, 1)
@@ -3,13 +3,16 @@ __credits__ = "Jeremy Schulman"
 
 import unittest
 from nose.plugins.attrib import attr
+import gzip
+import hashlib
+import os
 
 from jnpr.junos import Device
 from jnpr.junos.utils.config import Config
 from jnpr.junos.exception import RpcError, LockError,\
     UnlockError, CommitError, RpcTimeoutError, ConfigLoadError
 
-from mock import MagicMock, patch
+from mock import MagicMock, patch, call
 from lxml import etree
 
 
@@ -23,6 +26,79 @@ class TestConfig(unittest.TestCase):
     def test_config_constructor(self):
         self.assertTrue(isinstance(self.conf._dev, Device))
 
+    def test_config_mode_private(self):
+        self.conf.rpc.open_configuration = MagicMock()
+        self.conf.rpc.close_configuration = MagicMock()
+        with Config(self.dev, mode='private') as conf:
+            conf.rpc.open_configuration.assert_called_with(private=True)
+        self.assertTrue(self.conf.rpc.close_configuration.called)
+
+    def test_config_mode_private_warning(self):
+        ex = RpcError(rsp=etree.XML(
+            '<rpc-error><error-severity>warning</error-severity>'
+            '<error-message>uncommitted changes will be discarded on exit'
+            '</error-message></rpc-error>'))
+        self.conf.rpc.open_configuration = MagicMock(side_effect=ex)
+        self.conf.rpc.close_configuration = MagicMock()
+        with Config(self.dev, mode='private'):
+            pass
+        self.assertTrue(self.conf.rpc.close_configuration.called)
+
+    def test_config_mode_private_error(self):
+        ex = RpcError(rsp=etree.XML(
+            '<rpc-error><error-severity>error</error-severity>'
+            '<error-message>configuration database locked</error-message>'
+            '</rpc-error>'))
+        self.conf.rpc.open_configuration = MagicMock(side_effect=ex)
+        self.assertRaises(LockError, Config(self.dev, mode='private')
+                          .__enter__)
+
+    def test_config_mode_ephemeral_instance(self):
+        self.conf.rpc.open_configuration = MagicMock()
+        self.conf.rpc.close_configuration = MagicMock()
+        self.conf.rpc.commit_configuration = MagicMock()
+        with Config(self.dev, mode='ephemeral',
+                    ephemeral_instance='eph1') as conf:
+            conf.rpc.open_configuration.assert_called_with(
+                ephemeral_instance='eph1')
+            self.assertRaises(ValueError, conf.commit, confirm=True)
+            conf.commit()
+        self.assertTrue(self.conf.rpc.close_configuration.called)
+
+    def test_config_mode_ephemeral_default(self):
+        self.conf.rpc.open_configuration = MagicMock()
+        self.conf.rpc.close_configuration = MagicMock()
+        with Config(self.dev, mode='ephemeral'):
+            self.conf.rpc.open_configuration.assert_called_with(
+                ephemeral=True)
+
+    def test_config_mode_exclusive(self):
+        self.conf.rpc.lock_configuration = MagicMock()
+        self.conf.rpc.load_configuration = MagicMock()
+        self.conf.rpc.unlock_configuration = MagicMock()
+        with Config(self.dev, mode='exclusive'):
+            self.assertTrue(self.conf.rpc.lock_configuration.called)
+        self.conf.rpc.load_configuration.assert_called_with(
+            {'compare': 'rollback', 'rollback': '0'})
+        self.assertTrue(self.conf.rpc.unlock_configuration.called)
+
+    def test_config_mode_close_error(self):
+        ex = RpcError(rsp=etree.XML(
+            '<rpc-error><error-severity>error</error-severity>'
+            '<error-message>not open</error-message></rpc-error>'))
+        self.conf.rpc.open_configuration = MagicMock()
+        self.conf.rpc.close_configuration = MagicMock(side_effect=ex)
+
+        def _session():
+            with Config(self.dev, mode='private'):
+                pass
+        self.assertRaises(UnlockError, _session)
+
+    def test_config_mode_invalid(self):
+        self.assertRaises(ValueError, Config, self.dev, mode='batch')
+        self.assertRaises(ValueError, Config, self.dev,
+                          ephemeral_instance='eph1')
+
     def test_config_confirm_true(self):
         self.conf.rpc.commit_configuration = MagicMock()
         self.conf.commit(confirm=True)
@@ -109,6 +185,39 @@ class TestConfig(unittest.TestCase):
         self.conf.rpc.commit_configuration = MagicMock(side_effect=ex)
         self.assertRaises(CommitError, self.conf.commit)
 
+    @patch('jnpr.junos.future.RpcFuture.__init__')
+    def test_config_commit_async(self, mock_init):
+        mock_init.return_value = None
+        future = self.conf.commit_async(comment='async', confirm=5,
+                                        timeout=300, detail=True)
+        rpc, timeout = mock_init.call_args[0][2:]
+        self.assertEqual(etree.tostring(rpc),
+                         '<commit-configuration detail="detail">'
+                         '<confirm-timeout>5</confirm-timeout>'
+                         '<confirmed/><log>async</log>'
+                         '</commit-configuration>')
+        self.assertEqual(timeout, 300)
+        with patch('jnpr.junos.future.RpcFuture.result') as mock_result:
+            mock_result.return_value = etree.XML('<commit-results/>')
+            self.assertEqual(future.result().tag, 'commit-results')
+
+    @patch('jnpr.junos.future.RpcFuture.__init__')
+    @patch('jnpr.junos.future.RpcFuture.result')
+    def test_config_commit_async_error(self, mock_result, mock_init):
+        mock_init.return_value = None
+        future = self.conf.commit_async()
+        mock_result.side_effect = RpcError(rsp=etree.XML(
+            '<rpc-reply><rpc-error><error-message>missing mandatory'
+            '</error-message></rpc-error></rpc-reply>'))
+        self.assertRaises(CommitError, future.result)
+        self.assertTrue(isinstance(future.exception(), CommitError))
+        mock_result.side_effect = RpcTimeoutError(self.dev, 'commit', 30)
+        self.assertRaises(RpcTimeoutError, future.result)
+
+    def test_config_commit_async_ephemeral_confirm(self):
+        conf = Config(self.dev, mode='ephemeral')
+        self.assertRaises(ValueError, conf.commit_async, confirm=True)
+
     def test_commit_check(self):
         self.conf.rpc.commit_configuration = MagicMock()
         self.assertTrue(self.conf.commit_check())
@@ -143,6 +252,125 @@ class TestConfig(unittest.TestCase):
             assert_called_with(
                 {'compare': 'rollback', 'rollback': '0', 'format': 'text'})
 
+    def _commit_info(self, seconds):
+        return etree.XML("""<commit-information>
+            <commit-history>
+            <sequence-number>0</sequence-number>
+            <user>rick</user>
+            <date-time seconds="%s">2014-03-24 16:34:32 UTC</date-time>
+            </commit-history></commit-information>""" % seconds)
+
+    def test_config_revision(self):
+        self.conf.rpc.get_commit_information = \
+            MagicMock(return_value=self._commit_info('1395678872'))
+        self.assertEqual(self.conf.revision(), '1395678872')
+
+    def test_config_revision_no_history(self):
+        self.conf.rpc.get_commit_information = \
+            MagicMock(return_value=etree.XML('<commit-information/>'))
+        self.assertEqual(self.conf.revision(), None)
+
+    def test_config_committed_cached(self):
+        self.conf.rpc.get_commit_information = \
+            MagicMock(return_value=self._commit_info('1'))
+        self.conf.rpc.get_configuration = \
+            MagicMock(return_value=etree.XML('<configuration/>'))
+        first = self.conf.committed()
+        self.assertTrue(self.conf.committed() is first)
+        self.assertTrue(self.conf.committed('1') is first)
+        self.conf.rpc.get_configuration.assert_called_once_with(
+            {'database': 'committed'})
+        self.assertRaises(ValueError, self.conf.committed, '0')
+
+    def test_config_diff_local(self):
+        self.conf.rpc.get_commit_information = \
+            MagicMock(return_value=self._commit_info('1'))
+        self.conf.rpc.get_configuration = MagicMock(side_effect=[
+            etree.XML('<configuration><system><host-name>a</host-name>'
+                      '</system></configuration>'),
+            etree.XML('<configuration><system><host-name>b</host-name>'
+                      '</system></configuration>')])
+        self.assertEqual(self.conf.diff(local=True),
+                         '\n[edit system]\n-  host-name a;\n'
+                         '+  host-name b;\n')
+        self.assertRaises(ValueError, self.conf.diff, 1, local=True)
+
+    def test_config_local_diff_revisions(self):
+        self.conf.store.put(self.dev.hostname, '1', etree.XML(
+            '<configuration><system/></configuration>'))
+        self.conf.store.put(self.dev.hostname, '2', etree.XML(
+            '<configuration><system/></configuration>'))
+        self.assertEqual(self.conf.local_diff('1', '2'), None)
+
+    def _running(self):
+        self.conf.rpc.get_commit_information = \
+            MagicMock(return_value=self._commit_info('1'))
+        self.conf.rpc.get_configuration = MagicMock(return_value=etree.XML(
+            '<configuration><version>1</version><system>'
+            '<host-name>a</host-name><domain-name>x.net</domain-name>'
+            '<ntp><server><name>10.0.0.1</name></server>'
+            '<server><name>10.0.0.2</name></server></ntp></system>'
+            '<interfaces><interface><name>ge-0/0/0</name></interface>'
+            '</interfaces></configuration>'))
+
+    def test_config_desired_delta_xml(self):
+        self._running()
+        delta = self.conf.desired_delta(
+            '<configuration><system><host-name>b</host-name>'
+            '<domain-name>x.net</domain-name><ntp><server>'
+            '<name>10.0.0.1</name></server></ntp></system></configuration>')
+        self.assertEqual(etree.tostring(delta),
+                         '<configuration><system><host-name>b</host-name>'
+                         '<ntp><server operation="delete">'
+                         '<name>10.0.0.2</name></server></ntp></system>'
+                         '</configuration>')
+
+    def test_config_desired_delta_flags(self):
+        self.conf.rpc.get_commit_information = \
+            MagicMock(return_value=self._commit_info('1'))
+        self.conf.rpc.get_configuration = MagicMock(return_value=etree.XML(
+            '<configuration><system><services><ssh/></services></system>'
+            '<interfaces><interface><name>ge-0/0/0</name><disable/>'
+            '<unit><name>0</name></unit></interface></interfaces>'
+            '</configuration>'))
+        delta = self.conf.desired_delta(
+            '<configuration><system><host-name>b</host-name></system>'
+            '<interfaces><interface><name>ge-0/0/0</name>'
+            '<unit><name>0</name></unit></interface></interfaces>'
+            '</configuration>')
+        self.assertEqual(etree.tostring(delta),
+                         '<configuration><system>'
+                         '<services operation="delete"/>'
+                         '<host-name>b</host-name></system><interfaces>'
+                         '<interface><name>ge-0/0/0</name>'
+                         '<disable operation="delete"/></interface>'
+                         '</interfaces></configuration>')
+
+    def test_config_desired_delta_bad_format(self):
+        self.assertRaises(ValueError, self.conf.desired_delta,
+                          'set system host-name b')
+
+    def test_config_load_desired(self):
+        self._running()
+        self.conf.rpc.load_config = MagicMock()
+        self.assertEqual(self.conf.load_desired(
+            etree.XML('<system><host-name>a</host-name>'
+                      '<domain-name>x.net</domain-name><ntp><server>'
+                      '<name>10.0.0.1</name></server><server>'
+                      '<name>10.0.0.2</name></server></ntp></system>')),
+            None)
+        self.assertFalse(self.conf.rpc.load_config.called)
+        self.conf.load_desired('<interfaces><interface><name>ge-0/0/0'
+                               '</name><description>up</description>'
+                               '</interface></interfaces>')
+        delta = self.conf.rpc.load_config.call_args[0][0]
+        self.assertEqual(etree.tostring(delta),
+                         '<configuration><interfaces><interface>'
+                         '<name>ge-0/0/0</name><description>up</description>'
+                         '</interface></interfaces></configuration>')
+        self.assertEqual(self.conf.rpc.load_config.call_args[1],
+                         {'format': 'xml', 'action': 'replace'})
+
     def test_config_pdiff(self):
         self.conf.diff = MagicMock(return_value='Stuff')
         self.conf.pdiff()
@@ -236,6 +464,14 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(self.conf.rpc.load_config.call_args[1]['format'],
                          'xml')
 
+    def test_config_load_template_path_rendered(self):
+        self.conf.rpc.load_config = MagicMock()
+        self.conf.dev.Template = MagicMock()
+        self.conf.load(template_path='test.conf', rendered='system {}')
+        self.assertFalse(self.conf.dev.Template.called)
+        self.assertEqual(self.conf.rpc.load_config.call_args,
+                         call('system {}', format='text', action='replace'))
+
     def test_config_load_template(self):
         class Temp:
             filename = 'abc.xml'
@@ -245,6 +481,211 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(self.conf.rpc.load_config.call_args[1]['format'],
                          'xml')
 
+    @patch('jnpr.junos.utils.scp.SCP')
+    def test_config_load_via_file(self, mock_scp):
+        copied = {}
+
+        def _put(local, remote):
+            copied['local'] = local
+            copied['remote'] = remote
+            copied['data'] = gzip.open(local).read()
+        mock_scp.return_value.__enter__.return_value.put.side_effect = _put
+        self.conf.rpc.load_configuration = MagicMock(return_value=True)
+        self.dev.rpc.file_delete = MagicMock(return_value=True)
+
+        self.assertTrue(self.conf.load('system { host-name r1; }',
+                                       format='text', via_file=True))
+        self.assertTrue(copied['remote'].startswith('/var/tmp/junos-eznc-'))
+        self.assertTrue(copied['remote'].endswith('.conf.gz'))
+        self.assertEqual(copied['data'], 'system { host-name r1; }')
+        self.conf.rpc.load_configuration.assert_called_once_with(
+            {'format': 'text', 'action': 'replace', 'url': copied['remote']})
+        self.dev.rpc.file_delete.assert_called_once_with(
+            path=copied['remote'])
+        self.assertFalse(os.path.exists(copied['local']))
+
+    @patch('jnpr.junos.utils.scp.SCP')
+    def test_config_load_via_file_xml_error(self, mock_scp):
+        copied = {}
+
+        def _put(local, remote):
+            copied['data'] = gzip.open(local).read()
+        mock_scp.return_value.__enter__.return_value.put.side_effect = _put
+        ex = RpcError(rsp=etree.XML(
+            '<rpc-error><error-severity>error</error-severity>'
+            '<error-message>syntax error</error-message></rpc-error>'))
+        self.conf.rpc.load_configuration = MagicMock(side_effect=ex)
+        self.dev.rpc.file_delete = MagicMock(return_value=True)
+
+        self.assertRaises(ConfigLoadError, self.conf.load,
+                          etree.XML('<system><host-name>r1</host-name>'
+                                    '</system>'), via_file='/tmp/')
+        self.assertEqual(copied['data'], '<configuration><system><host-name>'
+                         'r1</host-name></system></configuration>')
+        self.assertTrue(self.dev.rpc.file_delete.call_args[1]['path']
+                        .startswith('/tmp/junos-eznc-'))
+
+    def _retrieve_mocks(self, mock_scp, mock_shell, data, md5=None):
+        files = {}
+
+        def _get(remote, local):
+            import tarfile
+            from StringIO import StringIO
+            tgz = tarfile.open(local, 'w:gz')
+            info = tarfile.TarInfo('var/tmp/junos-eznc.xml')
+            info.size = len(data)
+            tgz.addfile(info, StringIO(data))
+            tgz.close()
+            files['remote'] = remote
+            files['local'] = local
+            files['md5'] = md5 or hashlib.md5(open(local, 'rb').read())\
+                .hexdigest()
+        mock_scp.return_value.__enter__.return_value.get.side_effect = _get
+        mock_shell.return_value.__enter__.return_value.last_ok = True
+        self.dev.rpc.file_archive = MagicMock(return_value=True)
+        self.dev.rpc.file_delete = MagicMock(return_value=True)
+        self.dev.rpc.get_checksum_information = MagicMock(
+            side_effect=lambda path: etree.XML(
+                '<checksum-information><file-checksum><checksum>%s'
+                '</checksum></file-checksum></checksum-information>' %
+                files['md5']))
+        return files
+
+    @patch('jnpr.junos.utils.start_shell.StartShell')
+    @patch('jnpr.junos.utils.scp.SCP')
+    def test_config_retrieve_xml(self, mock_scp, mock_shell):
+        files = self._retrieve_mocks(
+            mock_scp, mock_shell,
+            '<rpc-reply><configuration><system><host-name>r1</host-name>'
+            '</system></configuration><cli/></rpc-reply>')
+        conf = self.conf.retrieve()
+        self.assertEqual(conf.findtext('system/host-name'), 'r1')
+        cmd = mock_shell.return_value.__enter__.return_value.run.call_args
+        self.assertTrue(cmd[0][0].startswith(
+            "cli -c 'show configuration | display xml | save /var/tmp/"))
+        self.assertTrue(files['remote'].endswith('.xml.tgz'))
+        self.assertEqual(self.dev.rpc.file_delete.call_count, 2)
+        self.assertFalse(os.path.exists(os.path.dirname(files['local'])))
+
+    @patch('jnpr.junos.utils.start_shell.StartShell')
+    @patch('jnpr.junos.utils.scp.SCP')
+    def test_config_retrieve_set(self, mock_scp, mock_shell):
+        self._retrieve_mocks(mock_scp, mock_shell, 'set system host-name r1')
+        self.assertEqual(self.conf.retrieve(format='set'),
+                         'set system host-name r1')
+
+    @patch('jnpr.junos.utils.start_shell.StartShell')
+    @patch('jnpr.junos.utils.scp.SCP')
+    def test_config_retrieve_checksum_mismatch(self, mock_scp, mock_shell):
+        self._retrieve_mocks(mock_scp, mock_shell, 'system {}', md5='bad')
+        self.assertRaises(RuntimeError, self.conf.retrieve, format='text')
+        self.assertEqual(self.dev.rpc.file_delete.call_count, 2)
+
+    @patch('jnpr.junos.utils.start_shell.StartShell')
+    def test_config_retrieve_save_error(self, mock_shell):
+        mock_shell.return_value.__enter__.return_value.last_ok = False
+        self.dev.rpc.file_delete = MagicMock(return_value=True)
+        self.assertRaises(RuntimeError, self.conf.retrieve)
+
+    @patch('jnpr.junos.utils.start_shell.StartShell')
+    @patch('jnpr.junos.utils.scp.SCP')
+    def test_config_retrieve_inherit(self, mock_scp, mock_shell):
+        self._retrieve_mocks(mock_scp, mock_shell, 'system {}')
+        self.conf.retrieve(format='text', inherit='inherit')
+        cmd = mock_shell.return_value.__enter__.return_value.run.call_args
+        self.assertTrue(cmd[0][0].startswith(
+            "cli -c 'show configuration | display inheritance | save "))
+
+    def test_config_retrieve_format_unknown(self):
+        self.assertRaises(ValueError, self.conf.retrieve, format='json')
+        self.assertRaises(ValueError, self.conf.retrieve, inherit='all')
+
+    def test_config_load_chunked_set(self):
+        self.conf.rpc.load_config = MagicMock()
+        progress = MagicMock()
+        cmds = '\n'.join('set system host-name r%d' % i for i in range(5))
+        self.assertEqual(self.conf.load_chunked(cmds, chunk_size=2,
+                                                timeout=60,
+                                                progress=progress), 3)
+        self.assertEqual(self.conf.rpc.load_config.call_args_list[2],
+                         call('set system host-name r4', format='text',
+                              action='set', dev_timeout=60))
+        progress.assert_called_with(self.dev, 'loaded batch 3')
+
+    def test_config_load_chunked_set_overwrite(self):
+        self.assertRaises(ValueError, self.conf.load_chunked,
+                          'set system host-name r1', overwrite=True)
+
+    def test_config_load_chunked_text(self):
+        self.conf.rpc.load_config = MagicMock()
+        text = ('system {\n    host-name "r{1}";\n    ntp {\n'
+                '        server 10.0.0.1;\n    }\n}\n'
+                'interfaces {\n    ge-0/0/0 {\n        mtu 9192;\n'
+                '    }\n}\n')
+        self.conf.load_chunked(text, chunk_size=2, overwrite=True)
+        calls = self.conf.rpc.load_config.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(calls[0][0][0].startswith('system {'))
+        self.assertTrue(calls[0][0][0].endswith('}'))
+        self.assertTrue(calls[1][0][0].startswith('interfaces {'))
+        self.assertEqual(calls[0][1], {'format': 'text',
+                                       'action': 'override'})
+        self.assertEqual(calls[1][1], {'format': 'text'})
+
+    def test_config_load_chunked_xml(self):
+        self.conf.rpc.load_config = MagicMock()
+        conf = etree.XML('<configuration><version>1</version>'
+                         '<system><host-name>r1</host-name><ntp/></system>'
+                         '<interfaces><interface><name>ge-0/0/0</name>'
+                         '</interface></interfaces></configuration>')
+        self.assertEqual(
+            self.conf.load_chunked(conf, chunk_size=2, merge=True), 2)
+        chunks = [etree.tostring(c[0][0])
+                  for c in self.conf.rpc.load_config.call_args_list]
+        self.assertEqual(chunks, [
+            '<configuration><version>1</version>'
+            '<system><host-name>r1</host-name></system></configuration>',
+            '<configuration><system><ntp/></system><interfaces><interface>'
+            '<name>ge-0/0/0</name></interface></interfaces></configuration>'])
+        self.assertEqual(self.conf.rpc.load_config.call_args[1],
+                         {'format': 'xml'})
+
+    def test_config_load_chunked_xml_replace(self):
+        self.conf.rpc.load_config = MagicMock()
+        conf = etree.XML('<configuration><system><host-name>r1</host-name>'
+                         '</system><policy-options replace="replace">'
+                         '<prefix-list><name>a</name></prefix-list>'
+                         '<prefix-list><name>b</name></prefix-list>'
+                         '<prefix-list><name>c</name></prefix-list>'
+                         '</policy-options></configuration>')
+        self.assertEqual(self.conf.load_chunked(conf, chunk_size=2), 1)
+        chunks = [etree.tostring(c[0][0])
+                  for c in self.conf.rpc.load_config.call_args_list]
+        self.assertEqual(chunks, [
+            '<configuration><system><host-name>r1</host-name></system>'
+            '<policy-options replace="replace">'
+            '<prefix-list><name>a</name></prefix-list>'
+            '<prefix-list><name>b</name></prefix-list>'
+            '<prefix-list><name>c</name></prefix-list>'
+            '</policy-options></configuration>'])
+
+    def test_config_load_chunked_errors(self):
+        ex = RpcError(rsp=etree.XML(
+            '<rpc-error><error-severity>error</error-severity>'
+            '<error-message>syntax error</error-message></rpc-error>'))
+        self.conf.rpc.load_config = MagicMock(side_effect=[None, ex, ex])
+        try:
+            self.conf.load_chunked('set a\nset b\nset c', chunk_size=1)
+        except ConfigLoadError as err:
+            self.assertEqual([e['chunk'] for e in err.errs], [1, 2])
+            self.assertEqual(err.errs[0]['message'], 'syntax error')
+        else:
+            self.fail('ConfigLoadError not raised')
+        self.assertEqual(self.conf.rpc.load_config.call_count, 3)
+
+    def test_config_load_chunked_format_unknown(self):
+        self.assertRaises(RuntimeError, self.conf.load_chunked, 'foo bar')
+
     def test_config_diff_exception(self):
         self.conf.rpc.get_configuration = MagicMock()
         self.assertRaises(ValueError, self.conf.diff, 51)
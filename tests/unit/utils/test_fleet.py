@@ -0,0 +1,90 @@
+import unittest
+from nose.plugins.attrib import attr
+
+from jnpr.junos import Device
+from jnpr.junos.utils.fleet import FleetConfig
+from jnpr.junos.exception import FleetError, CommitError, LockError
+
+from mock import MagicMock
+from lxml import etree
+
+
+@attr('unit')
+class TestFleetConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.devs = [Device(host='10.0.0.%d' % i) for i in range(1, 4)]
+        self.fleet = FleetConfig(self.devs, workers=2)
+        for dev, cu in self.fleet._cu:
+            for name in ['lock', 'load', 'commit_check', 'commit',
+                         'unlock', 'rollback']:
+                setattr(cu, name, MagicMock(return_value=True))
+        self.cus = [cu for dev, cu in self.fleet._cu]
+        self.err_rsp = etree.XML(
+            '<rpc-error><error-severity>error</error-severity>'
+            '<error-message>failed</error-message></rpc-error>')
+
+    def test_push(self):
+        got = self.fleet.push('set system ntp server 10.1.1.1',
+                              comment='ntp')
+        self.assertEqual(got, {'10.0.0.1': True, '10.0.0.2': True,
+                               '10.0.0.3': True})
+        for cu in self.cus:
+            cu.load.assert_called_once_with('set system ntp server 10.1.1.1')
+            self.assertTrue(cu.commit_check.called)
+            cu.commit.assert_called_once_with(comment='ntp')
+            self.assertTrue(cu.unlock.called)
+            self.assertFalse(cu.rollback.called)
+
+    def test_load_failure_aborts_all(self):
+        self.cus[1].lock.side_effect = LockError(rsp=self.err_rsp)
+        try:
+            self.fleet.load(path='ntp.set')
+        except FleetError as err:
+            self.assertEqual(err.phase, 'load')
+            self.assertEqual(err.errs.keys(), ['10.0.0.2'])
+        else:
+            self.fail('FleetError not raised')
+        for i in [0, 2]:
+            self.assertTrue(self.cus[i].rollback.called)
+            self.assertTrue(self.cus[i].unlock.called)
+        self.assertFalse(self.cus[1].unlock.called)
+
+    def test_commit_check_failure_aborts_all(self):
+        self.cus[2].commit_check.return_value = {'message': 'bad'}
+        self.fleet.load(path='ntp.set')
+        self.assertRaises(FleetError, self.fleet.commit_check)
+        for cu in self.cus:
+            self.assertTrue(cu.rollback.called)
+            self.assertFalse(cu.commit.called)
+
+    def test_commit_confirm(self):
+        self.fleet.load(path='ntp.set')
+        self.fleet.commit(confirm=5)
+        for cu in self.cus:
+            cu.commit.assert_called_once_with(confirm=5)
+            self.assertFalse(cu.unlock.called)
+        self.fleet.confirm(comment='verified')
+        for cu in self.cus:
+            cu.commit.assert_called_with(comment='verified')
+            self.assertTrue(cu.unlock.called)
+
+    def test_commit_failure(self):
+        self.cus[1].commit.side_effect = CommitError(rsp=self.err_rsp)
+        self.fleet.load(path='ntp.set')
+        try:
+            self.fleet.commit(confirm=5, workers=1)
+        except FleetError as err:
+            self.assertEqual(err.phase, 'commit')
+            self.assertTrue(isinstance(err.errs['10.0.0.2'], CommitError))
+            self.assertTrue(isinstance(err.errs['10.0.0.3'], RuntimeError))
+            self.assertEqual(len(err.errs), 2)
+        else:
+            self.fail('FleetError not raised')
+        # no commit is started once one has failed
+        self.assertFalse(self.cus[2].commit.called)
+        self.assertFalse(self.cus[0].rollback.called)
+        self.assertTrue(self.cus[1].rollback.called)
+        self.assertTrue(self.cus[2].rollback.called)
+        for cu in self.cus:
+            self.assertTrue(cu.unlock.called)
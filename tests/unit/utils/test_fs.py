@@ -12,6 +12,7 @@ from jnpr.junos import Device
 from jnpr.junos.utils.fs import FS
 
 from mock import patch, MagicMock, call
+from lxml import etree
 
 
 @attr('unit')
@@ -141,6 +142,114 @@ class TestFS(unittest.TestCase):
                          {'files': ['abc'], 'path': '/var',
                           'type': 'dir', 'file_count': 1, 'size': 2})
 
+    def _remote_file(self, mock_sftp, data):
+        from StringIO import StringIO
+        rfile = StringIO(data)
+        rfile.stat = MagicMock(return_value=MagicMock(st_size=len(data)))
+        rfile.prefetch = MagicMock()
+        mock_sftp.return_value.open.return_value = rfile
+        return rfile
+
+    @patch('jnpr.junos.utils.scp.SCP.close')
+    @patch('jnpr.junos.utils.scp.SCP.open_sftp')
+    def test_open_read_chunks(self, mock_sftp, mock_close):
+        self._remote_file(mock_sftp, 'abcdefghij')
+        with self.fs.open_read('/var/log/messages', chunk_size=4) as rfile:
+            self.assertEqual(list(rfile), ['abcd', 'efgh', 'ij'])
+            self.assertEqual((rfile.size, rfile.position), (10, 10))
+        mock_sftp.return_value.open.assert_called_with('/var/log/messages',
+                                                       'rb')
+        self.assertTrue(mock_close.called)
+
+    @patch('jnpr.junos.utils.scp.SCP.close')
+    @patch('jnpr.junos.utils.scp.SCP.open_sftp')
+    def test_open_read_range(self, mock_sftp, mock_close):
+        rfile = self._remote_file(mock_sftp, 'abcdefghij')
+        with self.fs.open_read('messages', offset=2, length=5) as reader:
+            self.assertEqual(reader.read(2), 'cd')
+            self.assertEqual(reader.read(), 'efg')
+            self.assertEqual(reader.read(), '')
+        rfile.prefetch.assert_called_with(7)
+
+    @patch('jnpr.junos.utils.scp.SCP.close')
+    @patch('jnpr.junos.utils.scp.SCP.open_sftp')
+    def test_open_read_tail(self, mock_sftp, mock_close):
+        self._remote_file(mock_sftp, 'abcdefghij')
+        with self.fs.open_read('messages', offset=-3) as reader:
+            self.assertEqual(reader.read(), 'hij')
+        self._remote_file(mock_sftp, 'abcdefghij')
+        with self.fs.open_read('messages', offset=-30) as reader:
+            self.assertEqual(reader.position, 0)
+
+    @patch('jnpr.junos.utils.scp.SCP.close')
+    @patch('jnpr.junos.utils.scp.SCP.open_sftp')
+    def test_open_read_not_found(self, mock_sftp, mock_close):
+        mock_sftp.return_value.open.side_effect = IOError(2, 'No such file')
+        self.assertRaises(IOError, self.fs.open_read('nope').open)
+        self.assertTrue(mock_close.called)
+
+    def _dir_list(self, path, detail=False):
+        tree = {'/var': ['log/', 'tmp/', 'a.txt'], '/var/log': ['messages'],
+                '/var/tmp': ['old/', 'b.tgz'], '/var/tmp/old': []}
+        if path not in tree:
+            return etree.XML('<directory-list><output>%s: No such file or '
+                             'directory</output></directory-list>' % path)
+        xml = '<directory-list><directory name="%s">' % path
+        for name in tree[path]:
+            xml += ('<file-information><file-name>%s</file-name>%s'
+                    '<file-permissions format="-rw-r--r--">644'
+                    '</file-permissions><file-owner>root</file-owner>'
+                    '<file-size>10</file-size><file-date format="Feb 17">'
+                    '1392651039</file-date></file-information>' %
+                    (name.rstrip('/'),
+                     '<file-directory/>' if name.endswith('/') else ''))
+        return etree.XML(xml + '</directory></directory-list>')
+
+    def test_iter_ls(self):
+        self.fs.dev.rpc.file_list = MagicMock(side_effect=self._dir_list)
+        files = self.fs.iter_ls('/var')
+        first = next(files)
+        self.assertEqual((first['path'], first['type'], first['size']),
+                         ('log', 'dir', 10))
+        self.assertEqual([f['path'] for f in files], ['tmp', 'a.txt'])
+
+    def test_iter_ls_file(self):
+        self.fs.dev.rpc.file_list = \
+            MagicMock(side_effect=self._mock_manager)
+        self.assertEqual([f['path'] for f in
+                          self.fs.iter_ls('test/stat/decode_file')],
+                         ['/var/abc.sh'])
+
+    def test_iter_ls_not_found(self):
+        self.fs.dev.rpc.file_list = MagicMock(side_effect=self._dir_list)
+        self.assertEqual(list(self.fs.iter_ls('/nope')), [])
+
+    def test_walk(self):
+        self.fs.dev.rpc.file_list = MagicMock(side_effect=self._dir_list)
+        self.assertEqual(list(self.fs.walk('/var')),
+                         [('/var', ['log', 'tmp'], ['a.txt']),
+                          ('/var/log', [], ['messages']),
+                          ('/var/tmp', ['old'], ['b.tgz']),
+                          ('/var/tmp/old', [], [])])
+
+    def test_walk_prune(self):
+        self.fs.dev.rpc.file_list = MagicMock(side_effect=self._dir_list)
+        walked = []
+        for dirpath, dirs, files in self.fs.walk('/var'):
+            walked.append(dirpath)
+            if 'tmp' in dirs:
+                dirs.remove('tmp')
+        self.assertEqual(walked, ['/var', '/var/log'])
+
+    def test_walk_workers(self):
+        self.fs.dev.rpc.file_list = MagicMock(side_effect=self._dir_list)
+        self.assertEqual([w[0] for w in self.fs.walk('/var', workers=4)],
+                         ['/var', '/var/log', '/var/tmp', '/var/tmp/old'])
+
+    def test_walk_not_found(self):
+        self.fs.dev.rpc.file_list = MagicMock(side_effect=self._dir_list)
+        self.assertEqual(list(self.fs.walk('/nope')), [])
+
     def test_ls_calling___decode_dir_type_symbolic_link(self):
         path = 'test/stat/decode_symbolic_link'
         self.fs.dev.rpc.file_list = \
@@ -31,6 +31,14 @@ class TestScp(unittest.TestCase):
         self.dev.scp.open()
         self.assertEqual(self.dev.scp.close(), None)
 
+    @patch('paramiko.SSHClient')
+    def test_scp_open_sftp(self, mock_connect):
+        scp = SCP(self.dev)
+        self.assertEqual(scp.open_sftp(),
+                         mock_connect.return_value.open_sftp.return_value)
+        scp.close()
+        self.assertTrue(mock_connect.return_value.close.called)
+
     @patch('paramiko.SSHClient')
     def test_scp_context(self, mock_connect):
         with SCP(self.dev) as scp:
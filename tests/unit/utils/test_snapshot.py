@@ -0,0 +1,92 @@
+import unittest
+from nose.plugins.attrib import attr
+import os
+import shutil
+import tempfile
+
+from jnpr.junos import Device
+from jnpr.junos.utils.snapshot import SnapshotStore, commit_revision
+
+from mock import MagicMock, patch
+from lxml import etree
+
+
+@attr('unit')
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dev = Device(host='1.1.1.1')
+        self.dev.rpc.get_commit_information = MagicMock(
+            side_effect=lambda: self._commit_info)
+        self.dev.rpc.get_configuration = MagicMock(
+            side_effect=lambda *args: etree.XML(
+                '<configuration><system><host-name>r%s</host-name>'
+                '</system></configuration>' % self._seconds))
+        self._set_revision('100')
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _set_revision(self, seconds):
+        self._seconds = seconds
+        self._commit_info = etree.XML(
+            """<commit-information xmlns:junos="http://xml.juniper.net/junos/12.1X46/junos">
+            <commit-history>
+            <sequence-number>0</sequence-number>
+            <user>rick</user>
+            <date-time junos:seconds="%s">2014-03-24 16:34:32 UTC</date-time>
+            </commit-history></commit-information>""" % seconds)
+
+    def test_commit_revision(self):
+        self.assertEqual(commit_revision(self.dev), '100')
+
+    def test_commit_revision_text(self):
+        self._commit_info = etree.XML(
+            '<commit-information><commit-history><date-time>'
+            '2014-03-24 16:34:32 UTC</date-time></commit-history>'
+            '</commit-information>')
+        self.assertEqual(commit_revision(self.dev), '2014-03-24 16:34:32 UTC')
+
+    def test_get_fetches_on_new_revision(self):
+        store = SnapshotStore()
+        first = store.get(self.dev)
+        self.assertTrue(store.get(self.dev) is first)
+        self.assertEqual(self.dev.rpc.get_configuration.call_count, 1)
+        self._set_revision('200')
+        self.assertEqual(store.get(self.dev).findtext('system/host-name'),
+                         'r200')
+        self.assertEqual(self.dev.rpc.get_configuration.call_count, 2)
+        self.assertTrue(store.get(self.dev, '100') is first)
+        self.assertEqual(store.revisions(self.dev.hostname), ['100', '200'])
+
+    def test_get_options(self):
+        SnapshotStore().get(self.dev)
+        self.dev.rpc.get_configuration.assert_called_once_with(
+            {'database': 'committed', 'inherit': 'inherit',
+             'groups': 'groups'})
+        self._set_revision('200')
+        SnapshotStore(options={}).get(self.dev)
+        self.dev.rpc.get_configuration.assert_called_with(
+            {'database': 'committed'})
+
+    def test_get_unknown_revision(self):
+        self.assertRaises(ValueError, SnapshotStore().get, self.dev, '50')
+
+    def test_persisted_between_stores(self):
+        SnapshotStore(self.tmpdir).get(self.dev)
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.tmpdir, '1.1.1.1', '100.xml.gz')))
+        store = SnapshotStore(self.tmpdir)
+        self.assertEqual(store.revisions('1.1.1.1'), ['100'])
+        self.assertEqual(store.get(self.dev).findtext('system/host-name'),
+                         'r100')
+        self.assertEqual(self.dev.rpc.get_configuration.call_count, 1)
+
+    @patch('jnpr.junos.utils.config.Config.retrieve')
+    def test_get_via_file(self, mock_retrieve):
+        mock_retrieve.return_value = etree.XML('<configuration/>')
+        store = SnapshotStore(via_file=True)
+        self.assertTrue(store.get(self.dev) is mock_retrieve.return_value)
+        self.assertFalse(self.dev.rpc.get_configuration.called)
+        mock_retrieve.assert_called_once_with(inherit='inherit')
@@ -6,12 +6,15 @@ from nose.plugins.attrib import attr
 
 import os
 import sys
+import shutil
+import tempfile
 from cStringIO import StringIO
 from contextlib import contextmanager
 
 from jnpr.junos import Device
 from jnpr.junos.exception import RpcError, SwRollbackError, RpcTimeoutError
 from jnpr.junos.utils.sw import SW
+import jnpr.junos.utils.sw
 from jnpr.junos.facts.swver import version_info
 from ncclient.manager import Manager, make_device_handler
 from ncclient.transport import SSHSession
@@ -95,6 +98,51 @@ class TestSW(unittest.TestCase):
         self.assertEqual(SW.local_sha1(package),
                          'da39a3ee5e6b4b0d3255bfef95601890afd80709')
 
+    def _checksum_file(self, data):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        package = os.path.join(tmpdir, 'test.tgz')
+        open(package, 'wb').write(data)
+        environ = patch.dict(os.environ, {'JUNOS_EZNC_CACHE': tmpdir})
+        environ.start()
+        self.addCleanup(environ.stop)
+        return package
+
+    def test_sw_local_checksum_cached(self):
+        package = self._checksum_file('abc')
+        with patch('jnpr.junos.utils.sw._hashfile',
+                   wraps=jnpr.junos.utils.sw._hashfile) as mock_hash:
+            self.assertEqual(SW.local_md5(package),
+                             '900150983cd24fb0d6963f7d28e17f72')
+            self.assertEqual(SW.local_md5(package),
+                             '900150983cd24fb0d6963f7d28e17f72')
+            self.assertEqual(mock_hash.call_count, 1)
+            self.assertEqual(SW.local_sha1(package),
+                             'a9993e364706816aba3e25717850c26c9cd0d89d')
+            self.assertEqual(SW.local_sha256(package)[:16],
+                             'ba7816bf8f01cfea')
+            self.assertEqual(mock_hash.call_count, 3)
+            SW.local_sha1(package)
+            SW.local_md5(package)
+            self.assertEqual(mock_hash.call_count, 3)
+
+    def test_sw_local_checksum_cache_changed(self):
+        package = self._checksum_file('abc')
+        SW.local_md5(package)
+        open(package, 'ab').write('d')
+        self.assertEqual(SW.local_md5(package),
+                         'e2fc714c4727ee9395f324cd2e7f331f')
+
+    def test_sw_local_checksum_cache_disabled(self):
+        package = self._checksum_file('abc')
+        with patch('jnpr.junos.utils.sw._hashfile',
+                   return_value='xyz') as mock_hash:
+            SW.local_md5(package, cache=False)
+            SW.local_md5(package, cache=False)
+            self.assertEqual(mock_hash.call_count, 2)
+        self.assertEqual(SW.local_md5(package),
+                         '900150983cd24fb0d6963f7d28e17f72')
+
     def test_sw_progress(self):
         with self.capture(SW.progress, self.dev, 'running') as output:
             self.assertEqual('1.1.1.1: running\n', output)
@@ -180,6 +228,16 @@ class TestSW(unittest.TestCase):
                                               cleanfs=True,
                                               checksum='96a35ab371e1ca10408c3caecdbd8a67'))
 
+    @patch('jnpr.junos.Device.execute')
+    def test_sw_safe_copy_cleanfs_timeout(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.sw.put = MagicMock()
+        self.sw.safe_copy('safecopy.tgz', cleanfs=True,
+                          checksum='96a35ab371e1ca10408c3caecdbd8a67')
+        cleanup = mock_execute.call_args_list[0]
+        self.assertEqual(cleanup[0][0].tag, 'request-system-storage-cleanup')
+        self.assertEqual(cleanup[1], {'dev_timeout': 300})
+
     @patch('jnpr.junos.Device.execute')
     def test_sw_safe_copy_return_false(self, mock_execute):
         # not passing checksum value, will get random from magicmock
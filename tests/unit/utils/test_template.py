@@ -0,0 +1,85 @@
+import unittest
+from nose.plugins.attrib import attr
+import os
+import shutil
+import tempfile
+
+import jinja2
+from jnpr.junos.utils.template import _MyTemplateLoader, _BytecodeCache, \
+    render_many, render_pool
+
+from mock import patch
+
+
+@attr('unit')
+class TestTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = _MyTemplateLoader()
+        self.loader.paths.append(os.path.join(os.path.dirname(__file__),
+                                              '..', 'templates'))
+        self.env = jinja2.Environment(loader=self.loader)
+
+    def test_render_many(self):
+        out = render_many('config-example.xml',
+                          [{'host_name': 'r1', 'domain_name': 'a.net'},
+                           {'host_name': 'r2', 'domain_name': 'b.net'}],
+                          env=self.env)
+        self.assertEqual(out, ['system {\n  host-name r1;\n'
+                               '  domain-name a.net;\n}',
+                               'system {\n  host-name r2;\n'
+                               '  domain-name b.net;\n}'])
+
+    def test_render_many_template_object(self):
+        template = self.env.get_template('config-example.xml')
+        self.assertEqual(len(render_many(template, [{}, None])), 2)
+
+    def test_loader_cwd_first(self):
+        tmpdir = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(tmpdir)
+            source, path, uptodate = self.loader.get_source(
+                None, 'config-example.xml')
+            self.assertNotEqual(path, os.path.join('.', 'config-example.xml'))
+            open('config-example.xml', 'w').write('system {}')
+            source, path, uptodate = self.loader.get_source(
+                None, 'config-example.xml')
+            self.assertEqual(path, os.path.join('.', 'config-example.xml'))
+            self.assertEqual(source, 'system {}')
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(tmpdir)
+
+    def test_loader_not_found(self):
+        self.assertRaises(jinja2.TemplateNotFound, self.loader.get_source,
+                          None, 'no-such-template.xml')
+
+    def test_bytecode_cache(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with patch.dict(os.environ, {'JUNOS_EZNC_CACHE': tmpdir}):
+                env = jinja2.Environment(loader=self.loader,
+                                         bytecode_cache=_BytecodeCache())
+                # nothing is made before a template is compiled
+                self.assertEqual(os.listdir(tmpdir), [])
+                env.get_template('config-example.xml')
+            self.assertTrue(os.listdir(os.path.join(tmpdir, 'jinja2')))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_bytecode_cache_disabled(self):
+        with patch.dict(os.environ, {'JUNOS_EZNC_CACHE': ''}):
+            env = jinja2.Environment(loader=self.loader,
+                                     bytecode_cache=_BytecodeCache())
+            self.assertEqual(len(render_many(
+                env.get_template('config-example.xml'), [{}])), 1)
+            self.assertEqual(env.bytecode_cache._fs_cache(), None)
+
+    def test_render_pool(self):
+        path = os.path.join(os.path.dirname(__file__), '..', 'templates',
+                            'config-example.xml')
+        var_sets = [{'host_name': 'r%d' % i, 'domain_name': 'x'}
+                    for i in range(4)]
+        out = list(render_pool(path, var_sets, processes=2))
+        self.assertEqual(out, render_many(path, var_sets, env=self.env))
@@ -3,9 +3,12 @@ __credits__ = "Jeremy Schulman"
 
 import unittest
 from nose.plugins.attrib import attr
+import os
+import shutil
+import tempfile
 
 from jnpr.junos import Device
-from jnpr.junos.utils.util import Util
+from jnpr.junos.utils.util import Util, cache_dir
 
 from mock import patch
 
@@ -19,6 +22,14 @@ class TestUtil(unittest.TestCase):
                           gather_facts=False)
         self.dev.open()
         self.util = Util(self.dev)
+        self.tmpdir = tempfile.mkdtemp()
+        self.environ = patch.dict(os.environ,
+                                  {'JUNOS_EZNC_CACHE': self.tmpdir})
+        self.environ.start()
+
+    def tearDown(self):
+        self.environ.stop()
+        shutil.rmtree(self.tmpdir)
 
     def test_repr(self):
         self.assertEqual(repr(self.util), 'jnpr.junos.utils.Util(1.1.1.1)')
@@ -32,3 +43,13 @@ class TestUtil(unittest.TestCase):
         def mod_rpc():
             self.util.rpc = 'abc'
         self.assertRaises(RuntimeError, mod_rpc)
+
+    def test_cache_dir(self):
+        self.assertEqual(cache_dir('foo', 'bar'),
+                         os.path.join(self.tmpdir, 'foo', 'bar'))
+        self.assertTrue(os.path.isdir(os.path.join(self.tmpdir, 'foo',
+                                                   'bar')))
+
+    def test_cache_dir_disabled(self):
+        with patch.dict(os.environ, {'JUNOS_EZNC_CACHE': ''}):
+            self.assertEqual(cache_dir('foo'), None)